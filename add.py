@@ -12,19 +12,46 @@ Outputs:
 - Verdict: Safe / Suspicious / Phishing
 """
 
+import asyncio
+import functools
 import socket
+import string
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 try:
     import dns.resolver  # from dnspython
+    import dns.asyncresolver
 except ImportError:
     dns = None
+    dns_async = None
     print("Warning: 'dnspython' is not installed. SPF/DMARC checks will be skipped.")
     print("Install it with: pip install dnspython\n")
 else:
+    dns_async = dns.asyncresolver
     dns = dns.resolver
 
 
+# -------------------------------
+# Helper: detect IP literals
+# -------------------------------
+def is_ip_literal(host: str) -> bool:
+    """
+    True if host is already an IPv4/IPv6 address, checked with
+    inet_pton so no resolver is involved.
+    """
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except (OSError, ValueError):
+            continue
+    return False
+
+
 # -------------------------------
 # Helper: extract domain from URL
 # -------------------------------
@@ -34,11 +61,20 @@ def extract_domain(input_str: str) -> str:
     Examples:
       'https://example.com/login' -> 'example.com'
       'example.com'               -> 'example.com'
+      '203.0.113.5'               -> '203.0.113.5'
     """
-    # If it looks like a URL, parse it
+    # Bare IP literal – nothing to parse
+    stripped = input_str.strip()
+    if is_ip_literal(stripped):
+        return stripped
+
+    # If it looks like a URL, take the host part between "://" and "/"
     if "://" in input_str:
-        parsed = urlparse(input_str)
-        return parsed.netloc.lower()
+        netloc = input_str.split("://", 1)[1].split("/", 1)[0]
+        # Userinfo or a query/fragment right after the host needs real parsing
+        if "@" in netloc or "?" in netloc or "#" in netloc:
+            netloc = urlparse(input_str).netloc
+        return netloc.lower()
     # Otherwise, treat it as a domain directly
     return input_str.strip().lower()
 
@@ -46,6 +82,20 @@ def extract_domain(input_str: str) -> str:
 # -------------------------------
 # DNS-based checks (SPF / DMARC)
 # -------------------------------
+def _has_txt_record(answers, marker: str) -> bool:
+    """
+    True if any TXT record in the answer set contains the marker
+    (e.g. 'v=spf1'). Shared by the sync and async lookups.
+    """
+    for rdata in answers:
+        txt = b"".join(rdata.strings).decode(errors="replace").lower()
+        if marker in txt:
+            return True
+    return False
+
+
+# Results are memoized per domain so bulk runs only query each domain once.
+@functools.lru_cache(maxsize=4096)
 def has_valid_spf(domain: str) -> bool | None:
     """
     Returns:
@@ -62,15 +112,11 @@ def has_valid_spf(domain: str) -> bool | None:
         # Could not resolve TXT records (network or DNS failure)
         return None
 
-    for rdata in answers:
-        txt = "".join(rdata.strings).lower()
-        if "v=spf1" in txt:
-            return True
-
-    # No SPF record found
-    return False
+    # False → no SPF record found
+    return _has_txt_record(answers, "v=spf1")
 
 
+@functools.lru_cache(maxsize=4096)
 def has_valid_dmarc(domain: str) -> bool | None:
     """
     Returns:
@@ -87,17 +133,99 @@ def has_valid_dmarc(domain: str) -> bool | None:
     except Exception:
         return None
 
-    for rdata in answers:
-        txt = "".join(rdata.strings).lower()
-        if "v=dmarc1" in txt:
-            return True
+    return _has_txt_record(answers, "v=dmarc1")
+
+
+# -------------------------------
+# Concurrent DNS checks (asyncio)
+# -------------------------------
+async def _txt_check_async(name: str, marker: str) -> bool | None:
+    """Async counterpart of has_valid_spf / has_valid_dmarc."""
+    if dns_async is None:
+        return None
+
+    try:
+        answers = await dns_async.resolve(name, "TXT")
+    except Exception:
+        return None
+
+    return _has_txt_record(answers, marker)
+
+
+async def _resolve_ip_async(domain: str) -> str | None:
+    """Async counterpart of resolve_ip."""
+    if is_ip_literal(domain):
+        return domain
+
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(domain, None, family=socket.AF_INET)
+    except Exception:
+        return None
+    return infos[0][4][0] if infos else None
+
+
+# Bounded LRU of gathered (spf_ok, dmarc_ok, ip) per domain:
+# key -> (value, expires_at). Shared by calculate_risk_batch's threads.
+DNS_CACHE_MAXSIZE = 4096
+DNS_CACHE_TTL = 300  # seconds
+_dns_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _get_cache(key: str) -> tuple | None:
+    with _cache_lock:
+        entry = _dns_cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del _dns_cache[key]
+            return None
+        _dns_cache.move_to_end(key)
+        return value
 
-    return False
+
+def _set_cache(key: str, value: tuple):
+    with _cache_lock:
+        _dns_cache[key] = (value, time.monotonic() + DNS_CACHE_TTL)
+        _dns_cache.move_to_end(key)
+        if len(_dns_cache) > DNS_CACHE_MAXSIZE:
+            _dns_cache.popitem(last=False)
+
+
+async def _gather_dns(domain: str) -> tuple[bool | None, bool | None, str | None]:
+    """
+    Runs the SPF, DMARC and A-record lookups for a domain concurrently,
+    so the three round trips overlap instead of running back to back.
+
+    Returns (spf_ok, dmarc_ok, resolved_ip).
+    """
+    cached = _get_cache(domain)
+    if cached is not None:
+        return cached
+
+    result = tuple(await asyncio.gather(
+        _txt_check_async(domain, "v=spf1"),
+        _txt_check_async(f"_dmarc.{domain}", "v=dmarc1"),
+        _resolve_ip_async(domain),
+    ))
+    # All-None means every lookup failed (timeout, no resolver); retry next time
+    if any(value is not None for value in result):
+        _set_cache(domain, result)
+    return result
 
 
 # -------------------------------
 # Heuristic: suspicious domain
 # -------------------------------
+# Suspicious TLDs (example list; feel free to change)
+SUSPICIOUS_TLDS = (".xyz", ".top", ".click", ".gq", ".ml", ".tk", ".zip")
+
+# Translation table that strips ASCII digits (used to count them in C)
+_STRIP_DIGITS = str.maketrans("", "", string.digits)
+
+
 def is_suspicious_domain(domain: str) -> bool:
     """
     Very simple heuristic for suspicious domains.
@@ -112,7 +240,7 @@ def is_suspicious_domain(domain: str) -> bool:
         return True
 
     # 3. Too many digits
-    digits = sum(c.isdigit() for c in domain)
+    digits = len(domain) - len(domain.translate(_STRIP_DIGITS))
     if digits >= 5:
         return True
 
@@ -120,11 +248,9 @@ def is_suspicious_domain(domain: str) -> bool:
     if domain.count("-") >= 3:
         return True
 
-    # 5. Suspicious TLDs (example list; feel free to change)
-    suspicious_tlds = {".xyz", ".top", ".click", ".gq", ".ml", ".tk", ".zip"}
-    for tld in suspicious_tlds:
-        if domain.endswith(tld):
-            return True
+    # 5. Suspicious TLDs (single str.endswith call over the whole tuple)
+    if domain.endswith(SUSPICIOUS_TLDS):
+        return True
 
     return False
 
@@ -132,6 +258,29 @@ def is_suspicious_domain(domain: str) -> bool:
 # -------------------------------
 # Unknown IP check
 # -------------------------------
+# Example whitelist – add your own known trusted IPs here.
+KNOWN_GOOD_IPS = frozenset({
+    "142.250.72.14",   # example: google.com (this may change over time)
+    "151.101.1.69",    # example: stackoverflow.com (may change)
+})
+
+
+@functools.lru_cache(maxsize=4096)
+def resolve_ip(domain: str) -> str | None:
+    """
+    Resolves the domain to an IPv4 address (memoized per domain).
+    Returns None if it could not be resolved.
+    """
+    # IP literals are used as-is, skipping the resolver
+    if is_ip_literal(domain):
+        return domain
+
+    try:
+        return socket.gethostbyname(domain)
+    except Exception:
+        return None
+
+
 def is_unknown_ip(domain: str) -> tuple[bool, str | None]:
     """
     Resolves the domain to an IP and decides if it is "unknown".
@@ -142,19 +291,20 @@ def is_unknown_ip(domain: str) -> tuple[bool, str | None]:
 
     Returns (is_unknown, ip_or_none).
     """
-    # Example whitelist – add your own known trusted IPs here.
-    known_good_ips = {
-        "142.250.72.14",   # example: google.com (this may change over time)
-        "151.101.1.69",    # example: stackoverflow.com (may change)
-    }
+    return classify_ip(resolve_ip(domain))
 
-    try:
-        ip = socket.gethostbyname(domain)
-    except Exception:
+
+def classify_ip(ip: str | None) -> tuple[bool, str | None]:
+    """
+    Decides if an already-resolved IP is "unknown" (see is_unknown_ip).
+
+    Returns (is_unknown, ip_or_none).
+    """
+    if ip is None:
         # Could not resolve – treat as unknown
         return True, None
 
-    if ip in known_good_ips:
+    if ip in KNOWN_GOOD_IPS:
         return False, ip
 
     # Everything not explicitly whitelisted is treated as unknown
@@ -167,14 +317,22 @@ def is_unknown_ip(domain: str) -> tuple[bool, str | None]:
 def calculate_risk(domain_or_url: str) -> dict:
     """
     Main function: returns a dict with all details.
+    Runs the DNS lookups concurrently; use calculate_risk_async
+    from code that is already inside an event loop.
+    """
+    return asyncio.run(calculate_risk_async(domain_or_url))
+
+
+async def calculate_risk_async(domain_or_url: str) -> dict:
+    """
+    Async version of calculate_risk for batch callers.
     """
     domain = extract_domain(domain_or_url)
 
-    # Individual checks
-    spf_ok = has_valid_spf(domain)       # True / False / None
-    dmarc_ok = has_valid_dmarc(domain)   # True / False / None
+    # Individual checks (SPF, DMARC and A-record run concurrently)
+    spf_ok, dmarc_ok, ip = await _gather_dns(domain)   # True / False / None
     suspicious = is_suspicious_domain(domain)
-    unknown_ip, resolved_ip = is_unknown_ip(domain)
+    unknown_ip, resolved_ip = classify_ip(ip)
 
     risk_score = 0
 
@@ -212,6 +370,25 @@ def calculate_risk(domain_or_url: str) -> dict:
     }
 
 
+# -------------------------------
+# Batch scoring
+# -------------------------------
+def calculate_risk_batch(domains: list[str], max_workers: int = 32) -> list[dict]:
+    """
+    Scores many domains/URLs at once; results keep the input order.
+
+    DNS is I/O-bound, so domains are fanned out over a thread pool. Each
+    worker runs its own event loop via calculate_risk, and dnspython
+    resolvers are only read (never reconfigured) so sharing them across
+    workers is safe. Repeat domains hit the per-domain DNS cache.
+    """
+    if not domains:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(domains))) as executor:
+        return list(executor.map(calculate_risk, domains))
+
+
 # -------------------------------
 # Simple command-line interface
 # -------------------------------
@@ -7,18 +7,29 @@ Integrated with score_calculator (combines ALL phishingtool modules)
 
 import sys
 import os
+import json
 from flask_cors import CORS
-from flask import Flask, request, jsonify
-from datetime import datetime
+from flask import Flask, Response, request, jsonify
 from waitress import serve
 
+# score_calculator imports its sibling modules by flat name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'phishingtool'))
+
+from phishingtool.analyzer import load_email
+from phishingtool.score_calculator import (
+    calculate_comprehensive_phishing_score,
+    save_to_json,
+    warmup_models
+)
+from phishingtool.attachment_analyzer import analyze_message
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+
+# Load ML models before serving (runs once per process / gunicorn worker)
+warmup_models()
 
 
 @app.route('/analyze_email_route', methods=['POST'])
@@ -37,25 +48,15 @@ def analyze_email_route():
         if not file.filename.endswith('.eml'):
             return jsonify({'error': 'Invalid file format. Please upload a .eml file'}), 400
 
-        # Save uploaded file temporarily
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        temp_filename = f"temp_{timestamp}_{file.filename}"
-        temp_path = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
-        file.save(temp_path)
-
         try:
-            # Import comprehensive score_calculator from phishingtool
-            from phishingtool.score_calculator import (
-                calculate_comprehensive_phishing_score,
-                save_to_json
-            )
+            # Parse the upload stream directly (no temp file on disk)
+            msg = load_email(file.stream)
 
             # Calculate comprehensive phishing score (includes ALL 12 modules)
-            result = calculate_comprehensive_phishing_score(temp_path)
+            result = calculate_comprehensive_phishing_score(msg)
 
             if result:
                 # Return result JSON with all component scores
-                from phishingtool.attachment_analyzer import analyze_eml
                 response = {
                     'status': 'success',
                     'data': {
@@ -69,7 +70,7 @@ def analyze_email_route():
                         'originating_ip': result['originating_ip'],
                         'component_scores': result.get('component_scores', {}),
                         'details': result.get('details', {}),
-                        'attachments':analyze_eml(file)
+                        'attachments': analyze_message(msg)
                     }
                 }
 
@@ -80,30 +81,26 @@ def analyze_email_route():
         except Exception as analysis_error:
             return jsonify({'error': f'Score calculation error: {str(analysis_error)}'}), 500
 
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
-
     except Exception as e:
         return jsonify({'error': f'Analysis error: {str(e)}'}), 500
 
 
+# Static health payload, serialized once at import
+_HEALTH_BODY = json.dumps({
+    'status': 'healthy',
+    'service': 'Email Phishing Analyzer - Comprehensive Scoring',
+    'modules': [
+        'Attachments', 'Authentication', 'Headers', 'Domain',
+        'URLs', 'Infrastructure', 'MIME', 'Timing',
+        'Metadata', 'IP Analysis', 'URL Security', 'Transformer'
+    ]
+}).encode()
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Email Phishing Analyzer - Comprehensive Scoring',
-        'modules': [
-            'Attachments', 'Authentication', 'Headers', 'Domain',
-            'URLs', 'Infrastructure', 'MIME', 'Timing',
-            'Metadata', 'IP Analysis', 'URL Security', 'Transformer'
-        ]
-    }), 200
+    return Response(_HEALTH_BODY, status=200, mimetype='application/json')
 
 if __name__ == "__main__":
     print("🚀 Starting Email Phishing Analyzer Web Server")
@@ -1,12 +1,24 @@
 from email import policy
+from email.message import Message
 from email.parser import BytesParser
 import sys
 import re
 from urllib.parse import urlparse
 
+from parser import decode_text_part
+
 # Fix Windows encoding issue
 sys.stdout.reconfigure(encoding='utf-8')
 
+# Shared parser (stateless between calls, so one instance serves every email)
+_PARSER = BytesParser(policy=policy.default)
+
+# Detect:
+# https://example.com
+# http://example.com
+# www.example.com
+_URL_RE = re.compile(r'https?://[^\s<>"\'()]+|www\.[^\s<>"\'()]+')
+
 
 # -------------------------------
 # Helper: Extract domain from email header
@@ -21,8 +33,19 @@ def extract_domain(email_header):
 # 1️⃣ Load email file
 # -------------------------------
 def load_email(file):
+    """
+    Accepts a path, a binary file object (e.g. an upload stream)
+    or an already parsed message, and returns the parsed message.
+    """
+    if isinstance(file, Message):
+        return file
+
+    # Parse file-like objects directly, no temp file needed
+    if hasattr(file, "read"):
+        return _PARSER.parse(file)
+
     with open(file, "rb") as f:
-        msg = BytesParser(policy=policy.default).parse(f)
+        msg = _PARSER.parse(f)
     return msg
 
 
@@ -71,6 +94,8 @@ def decode_body(msg):
     body = ""
 
     if msg.is_multipart():
+        # Collect parts and join once instead of repeated string concatenation
+        body_parts = []
         for part in msg.walk():
             content_type = part.get_content_type()
             content_disposition = str(part.get("Content-Disposition"))
@@ -79,10 +104,12 @@ def decode_body(msg):
                 continue
 
             if content_type == "text/plain":
-                body += part.get_content()
+                body_parts.append(decode_text_part(part))
 
             elif content_type == "text/html":
-                body += part.get_content()
+                body_parts.append(decode_text_part(part))
+
+        body = "".join(body_parts)
 
     else:
         body = msg.get_content()
@@ -97,13 +124,7 @@ def extract_urls(body):
     if not body:
         return []
 
-    # Detect:
-    # https://example.com
-    # http://example.com
-    # www.example.com
-    url_pattern = r'(https?://[^\s<>"\'()]+|www\.[^\s<>"\'()]+)'
-
-    found_urls = re.findall(url_pattern, body)
+    found_urls = _URL_RE.findall(body)
 
     urls = []
     for url in found_urls:
@@ -6,9 +6,13 @@ detecting various attack vectors and suspicious patterns. Risk score is 0-100 (c
 """
 
 import email
+import mmap
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from email import policy
+from email.feedparser import BytesFeedParser
+from email.message import Message
 from typing import Dict, List, Optional, Tuple
 
 # Default MIME type when not specified in email
@@ -18,6 +22,9 @@ DEFAULT_MIME_TYPE = "application/octet-stream"
 DANGEROUS_EXTENSIONS = {".exe", ".bat", ".cmd", ".scr", ".js", ".vbs", ".ps1", ".jar"}
 MACRO_EXTENSIONS = {".docm", ".xlsm", ".pptm"}
 MAX_FILE_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB
+MMAP_THRESHOLD_BYTES = 1024 * 1024  # Memory-map .eml files at least this large
+MMAP_FEED_CHUNK_BYTES = 64 * 1024  # Bytes handed to the parser per feed() call
+MAX_ANALYSIS_WORKERS = 8  # Threads used to decode/analyze attachments of one email
 MAX_RISK_SCORE = 100  # Cap final score at 100
 
 # CRITICAL RULES - single trigger → MALICIOUS (40+)
@@ -31,6 +38,7 @@ SCORE_MIME_MISMATCH = 15         # MIME mismatch
 # MEDIUM RULES - contributes to score, typically SAFE alone
 SCORE_LARGE_FILE = 8             # Large file (>20 MB)
 
+# Expected MIME type per extension (values lowercased once below)
 MIME_MAP = {
     ".pdf": "application/pdf",
     ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -50,55 +58,69 @@ MIME_MAP = {
     ".xlsm": "application/vnd.ms-excel.sheet.macroEnabled.12",
     ".pptm": "application/vnd.ms-powerpoint.presentation.macroEnabled.12",
 }
+MIME_MAP = {ext: mime.lower() for ext, mime in MIME_MAP.items()}
 
 
-def check_dangerous_extension(filename: str) -> bool:
+def split_extension(filename: str) -> Tuple[str, str]:
     """
-    Check if file has a dangerous extension.
+    Lowercase a filename and split off its extension once, so the
+    individual checks don't each repeat the work.
     
     Args:
         filename: Name of the file
         
+    Returns:
+        (lowercased filename, lowercased extension including the dot or "")
+    """
+    fn_lower = filename.lower()
+    return fn_lower, os.path.splitext(fn_lower)[1]
+
+
+def check_dangerous_extension(ext: str) -> bool:
+    """
+    Check if file has a dangerous extension.
+    
+    Args:
+        ext: Lowercased file extension (from split_extension)
+        
     Returns:
         True if extension is dangerous, False otherwise
     """
-    _, ext = os.path.splitext(filename.lower())
     return ext in DANGEROUS_EXTENSIONS
 
 
-def check_double_extension(filename: str) -> bool:
+def check_double_extension(fn_lower: str) -> bool:
     """
     Detect double extension attack pattern.
     
     Checks if filename has multiple dots AND the last extension is dangerous.
     
     Args:
-        filename: Name of the file
+        fn_lower: Lowercased name of the file
         
     Returns:
         True if double extension attack detected, False otherwise
     """
-    parts = filename.lower().split(".")
-    if len(parts) < 3:  # Need at least 3 parts for double extension (e.g., "file.pdf.exe")
+    last_dot = fn_lower.rfind(".")
+    # Need at least 2 dots for double extension (e.g., "file.pdf.exe")
+    if last_dot == -1 or fn_lower.rfind(".", 0, last_dot) == -1:
         return False
     
-    last_ext = "." + parts[-1]
-    return last_ext in DANGEROUS_EXTENSIONS
+    return fn_lower[last_dot:] in DANGEROUS_EXTENSIONS
 
 
-def check_mime_mismatch(filename: str, mime_type: str) -> bool:
+def check_mime_mismatch(ext: str, mime_type: str) -> bool:
     """
     Check if file extension matches expected MIME type.
     
     Args:
-        filename: Name of the file
-        mime_type: Detected MIME type
+        ext: Lowercased file extension (from split_extension)
+        mime_type: Detected MIME type (already lowercase when it comes from
+            get_content_type(); other casings are still accepted)
         
     Returns:
         True if mismatch detected, False otherwise
     """
-    _, ext = os.path.splitext(filename.lower())
-    
     if not ext:
         return False
     
@@ -107,21 +129,20 @@ def check_mime_mismatch(filename: str, mime_type: str) -> bool:
         # Extension not in our mapping, can't verify
         return False
     
-    # Normalize MIME types for comparison (case-insensitive)
-    return expected_mime.lower() != mime_type.lower()
+    # MIME_MAP values are lowercase; only lowercase the input if it differs
+    return expected_mime != mime_type and expected_mime != mime_type.lower()
 
 
-def check_macro_extension(filename: str) -> bool:
+def check_macro_extension(ext: str) -> bool:
     """
     Check if file has Office macro-enabled extension.
     
     Args:
-        filename: Name of the file
+        ext: Lowercased file extension (from split_extension)
         
     Returns:
         True if macro extension detected, False otherwise
     """
-    _, ext = os.path.splitext(filename.lower())
     return ext in MACRO_EXTENSIONS
 
 
@@ -179,10 +200,11 @@ def analyze_attachment(filename: str, file_bytes: bytes, mime_type: str) -> Dict
         Dictionary with filename, mime_type, size_bytes, checks, risk_score (0-100), verdict.
     """
     size_bytes = len(file_bytes)
-    dangerous_ext = check_dangerous_extension(filename)
-    double_ext = check_double_extension(filename)
-    mime_mismatch = check_mime_mismatch(filename, mime_type)
-    macro_ext = check_macro_extension(filename)
+    fn_lower, ext = split_extension(filename)
+    dangerous_ext = check_dangerous_extension(ext)
+    double_ext = check_double_extension(fn_lower)
+    mime_mismatch = check_mime_mismatch(ext, mime_type)
+    macro_ext = check_macro_extension(ext)
     large_file = size_bytes > MAX_FILE_SIZE_BYTES
 
     risk_score = calculate_risk_score(
@@ -222,11 +244,67 @@ def extract_attachments_from_eml(eml_path: str) -> List[Tuple[str, bytes, str]]:
         List of (filename, file_bytes, mime_type) for each attachment.
         Filename may be empty; mime_type defaults to application/octet-stream.
     """
-    attachments: List[Tuple[str, bytes, str]] = []
+    return extract_attachments_from_message(_parse_eml_file(eml_path))
+
+
+def _parse_eml_file(eml_path: str) -> Message:
+    """
+    Parse a .eml file, memory-mapping it when it is large.
     
+    Large files are fed to the parser in fixed-size slices of the mapping,
+    so the OS pages the raw file in on demand instead of it being read
+    through an extra buffered copy.
+    
+    Args:
+        eml_path: Path to the .eml file.
+        
+    Returns:
+        Parsed email message.
+    """
     with open(eml_path, "rb") as f:
-        msg = email.message_from_binary_file(f, policy=policy.default)
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD_BYTES:
+            return email.message_from_binary_file(f, policy=policy.default)
+        
+        feed_parser = BytesFeedParser(policy=policy.default)
+        carry = b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, size, MMAP_FEED_CHUNK_BYTES):
+                chunk = carry + mm[start:start + MMAP_FEED_CHUNK_BYTES]
+                # Hold back a trailing CR in case its LF starts the next slice
+                carry = b"\r" if chunk.endswith(b"\r") else b""
+                if carry:
+                    chunk = chunk[:-1]
+                # Universal newlines, as message_from_binary_file applies
+                feed_parser.feed(chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+        if carry:
+            feed_parser.feed(b"\n")
+        return feed_parser.close()
+
+
+def extract_attachments_from_message(msg: Message) -> List[Tuple[str, bytes, str]]:
+    """
+    Extract all attachments from an already parsed email message.
     
+    Args:
+        msg: Parsed email message.
+        
+    Returns:
+        List of (filename, file_bytes, mime_type) for each attachment.
+    """
+    return [
+        (filename, _decode_attachment(part), part.get_content_type() or DEFAULT_MIME_TYPE)
+        for filename, part in _iter_attachment_parts(msg)
+    ]
+
+
+def _iter_attachment_parts(msg: Message):
+    """
+    Yield (filename, part) for each attachment without decoding its payload.
+    
+    Args:
+        msg: Parsed email message.
+    """
     for part in msg.walk():
         content_disposition = (part.get("Content-Disposition") or "").lower()
         filename = part.get_filename()
@@ -236,14 +314,13 @@ def extract_attachments_from_eml(eml_path: str) -> List[Tuple[str, bytes, str]]:
             filename = "unnamed_attachment"
         else:
             continue
-        
-        payload = part.get_payload(decode=True)
-        if payload is None:
-            payload = b""
-        content_type = part.get_content_type() or DEFAULT_MIME_TYPE
-        attachments.append((filename, payload, content_type))
-    
-    return attachments
+        yield filename, part
+
+
+def _decode_attachment(part: Message) -> bytes:
+    """Decoded payload of an attachment part (empty bytes if none)."""
+    payload = part.get_payload(decode=True)
+    return b"" if payload is None else payload
 
 
 def analyze_eml(eml_path: str) -> List[Dict]:
@@ -271,16 +348,46 @@ def analyze_eml(eml_path: str) -> List[Dict]:
         raise FileNotFoundError(f"EML file not found: {eml_path}")
     if not eml_path.lower().endswith(".eml"):
         raise ValueError("Input file must have .eml extension")
-    results: List[Dict] = []
-    for filename, file_bytes, mime_type in extract_attachments_from_eml(eml_path):
-        results.append(analyze_attachment(filename, file_bytes, mime_type))
-    return results
+    parts = list(_iter_attachment_parts(_parse_eml_file(eml_path)))
+    if len(parts) <= 1:
+        return [_analyze_part(filename, part) for filename, part in parts]
+    
+    # Payload decoding dominates; spread it over a small pool, keeping order
+    with ThreadPoolExecutor(max_workers=min(MAX_ANALYSIS_WORKERS, len(parts))) as executor:
+        return list(executor.map(lambda item: _analyze_part(*item), parts))
+
+
+def _analyze_part(filename: str, part: Message) -> Dict:
+    """Decode one attachment part and run analyze_attachment on it."""
+    mime_type = part.get_content_type() or DEFAULT_MIME_TYPE
+    return analyze_attachment(filename, _decode_attachment(part), mime_type)
+
+
+def analyze_message(msg: Message) -> List[Dict]:
+    """
+    Analyze all attachments in an already parsed email message.
+    Same result format as analyze_eml, for callers that hold the message
+    in memory (e.g. an upload stream) instead of a .eml path.
+
+    Args:
+        msg: Parsed email message.
+
+    Returns:
+        List of dicts, one per attachment (see analyze_eml).
+    """
+    return [
+        analyze_attachment(filename, file_bytes, mime_type)
+        for filename, file_bytes, mime_type in extract_attachments_from_message(msg)
+    ]
 
 
 def analyze_eml_highest_risk(eml_path: str) -> Optional[Dict]:
     """
     Analyze all attachments in a .eml file and return only the one with the highest risk score.
     Same dict format as analyze_eml; returns None if the email has no attachments.
+    
+    Stops at the first attachment that reaches MAX_RISK_SCORE: nothing later can
+    outscore it, so the remaining payloads are not decoded.
 
     Args:
         eml_path: Path to the .eml file.
@@ -288,10 +395,19 @@ def analyze_eml_highest_risk(eml_path: str) -> Optional[Dict]:
     Returns:
         The single analysis result dict with the highest risk_score, or None if no attachments.
     """
-    results = analyze_eml(eml_path)
-    if not results:
-        return None
-    return max(results, key=lambda r: r["risk_score"])
+    if not os.path.isfile(eml_path):
+        raise FileNotFoundError(f"EML file not found: {eml_path}")
+    if not eml_path.lower().endswith(".eml"):
+        raise ValueError("Input file must have .eml extension")
+    
+    highest: Optional[Dict] = None
+    for filename, part in _iter_attachment_parts(_parse_eml_file(eml_path)):
+        result = _analyze_part(filename, part)
+        if highest is None or result["risk_score"] > highest["risk_score"]:
+            highest = result
+            if highest["risk_score"] >= MAX_RISK_SCORE:
+                break
+    return highest
 
 
 if __name__ == "__main__":
@@ -8,13 +8,13 @@ import os
 
 
 # Dangerous file extensions
-EXECUTABLE_EXTENSIONS = [
+EXECUTABLE_EXTENSIONS = frozenset({
     ".exe", ".bat", ".cmd", ".scr", ".js", ".vbs", ".ps1"
-]
+})
 
-MACRO_EXTENSIONS = [
+MACRO_EXTENSIONS = frozenset({
     ".docm", ".xlsm", ".pptm"
-]
+})
 
 
 # --------------------------------------------------
@@ -84,10 +84,10 @@ def run_attachment_checks(attachments):
             results["macro_file"] = True
 
     # Overall risk
-    results["attachment_suspicious"] = any([
-        results["dangerous_extension"],
-        results["double_extension"],
-        results["macro_file"]
-    ])
+    results["attachment_suspicious"] = (
+        results["dangerous_extension"]
+        or results["double_extension"]
+        or results["macro_file"]
+    )
 
     return results
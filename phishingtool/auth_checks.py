@@ -7,6 +7,18 @@ Pure rule-based logic (no AI)
 import re
 
 
+# SPF, DKIM, DMARC, ARC results and DKIM signing domain (header.d=example.com)
+# fused into one alternation so the header is scanned once
+_AUTH_RE = re.compile(
+    r"spf=(?P<spf_result>\w+)"
+    r"|dkim=(?P<dkim_result>\w+)"
+    r"|dmarc=(?P<dmarc_result>\w+)"
+    r"|arc=(?P<arc_result>\w+)"
+    r"|header\.d=(?P<dkim_domain>[^\s;]+)",
+    re.IGNORECASE
+)
+
+
 # --------------------------------------------------
 # Extract authentication results from header string
 # --------------------------------------------------
@@ -27,31 +39,11 @@ def parse_authentication_results(auth_header: str) -> dict:
     if not auth_header:
         return results
 
-    # SPF
-    spf_match = re.search(r"spf=(\w+)", auth_header, re.IGNORECASE)
-    if spf_match:
-        results["spf_result"] = spf_match.group(1).lower()
-
-    # DKIM
-    dkim_match = re.search(r"dkim=(\w+)", auth_header, re.IGNORECASE)
-    if dkim_match:
-        results["dkim_result"] = dkim_match.group(1).lower()
-
-    # DMARC
-    dmarc_match = re.search(r"dmarc=(\w+)", auth_header, re.IGNORECASE)
-    if dmarc_match:
-        results["dmarc_result"] = dmarc_match.group(1).lower()
-
-    # ARC
-    arc_match = re.search(r"arc=(\w+)", auth_header, re.IGNORECASE)
-    if arc_match:
-        results["arc_result"] = arc_match.group(1).lower()
-
-    # DKIM Signing Domain (header.d=example.com)
-    dkim_domain_match = re.search(
-        r"header\.d=([^\s;]+)", auth_header, re.IGNORECASE)
-    if dkim_domain_match:
-        results["dkim_domain"] = dkim_domain_match.group(1).lower()
+    # Single pass over the header; the first occurrence of each key wins
+    for match in _AUTH_RE.finditer(auth_header):
+        key = match.lastgroup
+        if results[key] is None:
+            results[key] = match.group(key).lower()
 
     return results
 
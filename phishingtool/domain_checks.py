@@ -4,10 +4,24 @@ Analyzes domain alignment and spoofing indicators
 Pure rule-based checks
 """
 
-# Common suspicious TLDs (can expand later)
-SUSPICIOUS_TLDS = [
-    ".ru", ".tk", ".xyz", ".top", ".gq", ".ml", ".cf"
-]
+import re
+
+# Common suspicious TLDs (can expand later), stored without the leading dot
+SUSPICIOUS_TLDS = frozenset({
+    "ru", "tk", "xyz", "top", "gq", "ml", "cf"
+})
+
+# Common phishing tricks (brand lookalikes)
+SPOOF_PATTERNS = (
+    "micros0ft",
+    "paypa1",
+    "g00gle",
+    "arnazon",
+    "faceb00k"
+)
+
+# All lookalikes in one alternation, so each domain is scanned once
+_SPOOF_RE = re.compile("|".join(map(re.escape, SPOOF_PATTERNS)))
 
 
 # --------------------------------------------------
@@ -18,11 +32,9 @@ def has_suspicious_tld(domain):
     if not domain:
         return False
 
-    for tld in SUSPICIOUS_TLDS:
-        if domain.endswith(tld):
-            return True
+    head, dot, tld = domain.rpartition(".")
 
-    return False
+    return bool(dot) and tld in SUSPICIOUS_TLDS
 
 
 # --------------------------------------------------
@@ -33,20 +45,7 @@ def looks_like_spoofed(domain):
     if not domain:
         return False
 
-    # Common phishing tricks
-    suspicious_patterns = [
-        "micros0ft",
-        "paypa1",
-        "g00gle",
-        "arnazon",
-        "faceb00k"
-    ]
-
-    for pattern in suspicious_patterns:
-        if pattern in domain:
-            return True
-
-    return False
+    return _SPOOF_RE.search(domain) is not None
 
 
 # --------------------------------------------------
@@ -5,6 +5,9 @@ Rule-based detection
 """
 
 
+# Headers longer than this are considered suspicious
+MAX_HEADER_LENGTH = 500
+
 # Required headers every legitimate email should have
 REQUIRED_HEADERS = [
     "from",
@@ -32,14 +35,7 @@ def missing_required_headers(metadata):
 # Detect duplicate headers
 # --------------------------------------------------
 def duplicate_headers(metadata):
-
-    duplicates = []
-
-    for key, value in metadata.items():
-        if isinstance(value, list) and len(value) > 1:
-            duplicates.append(key)
-
-    return duplicates
+    return scan_header_values(metadata)[0]
 
 
 # --------------------------------------------------
@@ -60,15 +56,26 @@ def invalid_message_id(message_id):
 # Detect suspicious header length
 # --------------------------------------------------
 def unusually_long_headers(metadata):
+    return scan_header_values(metadata)[1]
 
+
+# --------------------------------------------------
+# Duplicate + long header detection in one pass
+# --------------------------------------------------
+def scan_header_values(metadata):
+
+    duplicates = []
     long_headers = []
 
     for key, value in metadata.items():
 
-        if isinstance(value, str) and len(value) > 500:
+        if isinstance(value, list):
+            if len(value) > 1:
+                duplicates.append(key)
+        elif isinstance(value, str) and len(value) > MAX_HEADER_LENGTH:
             long_headers.append(key)
 
-    return long_headers
+    return duplicates, long_headers
 
 
 # --------------------------------------------------
@@ -77,9 +84,8 @@ def unusually_long_headers(metadata):
 def run_header_checks(metadata):
 
     missing = missing_required_headers(metadata)
-    duplicates = duplicate_headers(metadata)
+    duplicates, long_headers = scan_header_values(metadata)
     invalid_msgid = invalid_message_id(metadata.get("message_id"))
-    long_headers = unusually_long_headers(metadata)
 
     results = {
         "missing_headers": missing,
@@ -88,11 +94,12 @@ def run_header_checks(metadata):
         "unusually_long_headers": long_headers
     }
 
-    results["header_suspicious"] = any([
-        missing,
-        duplicates,
-        invalid_msgid,
-        long_headers
-    ])
+    # bool(): missing/duplicates/long_headers are lists
+    results["header_suspicious"] = bool(
+        missing
+        or duplicates
+        or invalid_msgid
+        or long_headers
+    )
 
     return results
@@ -1,88 +1,164 @@
 import re
+import socket
 import ipaddress
 from email.message import Message
 
 
-def extract_ips(metadata):
+# IPv4 octet bounded to 0-255 so out-of-range strings never reach ipaddress
+_IPV4_OCTET = r'(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+_IPV4 = rf'(?:{_IPV4_OCTET}\.){{3}}{_IPV4_OCTET}'
+
+# IPv6 pattern - at least one hex digit per group and at most one "::",
+# anchored with lookarounds so the engine never retries mid-run on
+# colon-heavy text (timestamps, SMTP ids). Still validated by ipaddress.
+# The first two branches take a trailing dotted quad (::ffff:8.8.8.8) so
+# IPv4-mapped literals are not cut off at the first dot.
+_IPV6_GROUP = r'[0-9a-fA-F]{1,4}'
+_IPV6 = (
+    rf'(?<![0-9a-fA-F:])'
+    rf'(?:(?:{_IPV6_GROUP}:){{6}}{_IPV4}'
+    rf'|(?:{_IPV6_GROUP}(?::{_IPV6_GROUP}){{0,4}})?::(?:{_IPV6_GROUP}:){{0,4}}{_IPV4}'
+    rf'|(?:{_IPV6_GROUP}:){{7}}{_IPV6_GROUP}'
+    rf'|(?:{_IPV6_GROUP}(?::{_IPV6_GROUP}){{0,6}})?::(?:{_IPV6_GROUP}(?::{_IPV6_GROUP}){{0,6}})?)'
+    rf'(?![0-9a-fA-F:])'
+)
+
+_IPV4_RE = re.compile(_IPV4)
+_IPV4_WORD_RE = re.compile(rf'\b{_IPV4}\b')
+_IPV6_RE = re.compile(_IPV6)
+
+# Private/reserved + loopback IPv4 ranges (same set ipaddress uses for
+# is_private / is_loopback) as (network, netmask) integer pairs
+_PRIVATE_IPV4_MASKS = tuple(
+    (int(net.network_address), int(net.netmask))
+    for net in map(ipaddress.IPv4Network, (
+        "0.0.0.0/8", "10.0.0.0/8", "127.0.0.0/8", "169.254.0.0/16",
+        "172.16.0.0/12", "192.0.0.0/29", "192.0.0.170/31", "192.0.2.0/24",
+        "192.168.0.0/16", "198.18.0.0/15", "198.51.100.0/24",
+        "203.0.113.0/24", "240.0.0.0/4", "255.255.255.255/32",
+    ))
+)
+
+# Same for IPv6 (ipaddress' private list plus ::1 loopback), as 128-bit pairs.
+# IPv4-mapped addresses (::ffff:0:0/96) are judged by their IPv4 part instead.
+_PRIVATE_IPV6_MASKS = tuple(
+    (int(net.network_address), int(net.netmask))
+    for net in map(ipaddress.IPv6Network, (
+        "::1/128", "::/128", "100::/64", "2001::/23",
+        "2001:2::/48", "2001:db8::/32", "2001:10::/28", "fc00::/7",
+        "fe80::/10",
+    ))
+)
+
+
+def _is_public_ipv4(ip):
     """
-    Extract all IPv4 and IPv6 addresses from email metadata.
+    Integer-mask private/loopback test for a dotted-quad IPv4 string,
+    avoiding IPv4Address construction and its network-containment chain.
+    """
+    return _is_public_ipv4_int(int.from_bytes(socket.inet_aton(ip), "big"))
 
-    :param metadata: dict containing email metadata (from extract_metadata)
-    :return: list of IP address strings (may include private/loopback)
+
+def _is_public_ipv4_int(value):
+    """Same test for an IPv4 address already packed into an int."""
+    return not any(value & mask == network for network, mask in _PRIVATE_IPV4_MASKS)
+
+
+def _is_public_ipv6(ip):
     """
-    # IPv4 pattern
-    ipv4_pattern = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
-    
-    # IPv6 pattern - matches various IPv6 formats
-    ipv6_pattern = r'(?:[0-9a-fA-F]{0,4}:){2,7}[0-9a-fA-F]{0,4}'
-    
-    ips = []
+    IPv6 counterpart of _is_public_ipv4. Validation is done by inet_pton,
+    so it raises OSError for strings that are not IPv6 addresses.
+    """
+    value = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+    if value >> 32 == 0xFFFF:
+        return _is_public_ipv4_int(value & 0xFFFFFFFF)
+    return not any(value & mask == network for network, mask in _PRIVATE_IPV6_MASKS)
 
-    # Extract from Received headers
-    received_headers = metadata.get("received") or []
-    for header in received_headers:
-        if not header:
-            continue
-        # Extract IPv4
-        found_ipv4 = re.findall(ipv4_pattern, header)
-        ips.extend(found_ipv4)
-        # Extract IPv6
-        found_ipv6 = re.findall(ipv6_pattern, header)
-        ips.extend(found_ipv6)
-
-    # Extract from X-Originating-IP header
+
+def iter_ips(metadata):
+    """
+    Lazily yield IPv4 and IPv6 addresses from email metadata in document
+    order (duplicates included), so callers that only need the first
+    match can stop early.
+
+    :param metadata: dict containing email metadata (from extract_metadata)
+    :return: iterator of IP address strings (may include private/loopback)
+    """
+    sources = [header for header in metadata.get("received") or [] if header]
     x_originating_ip = metadata.get("x_originating_ip")
     if x_originating_ip:
-        # Extract IPv4
-        found_ipv4 = re.findall(ipv4_pattern, x_originating_ip)
-        ips.extend(found_ipv4)
-        # Extract IPv6
-        found_ipv6 = re.findall(ipv6_pattern, x_originating_ip)
-        ips.extend(found_ipv6)
+        sources.append(x_originating_ip)
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_ips = []
-    for ip in ips:
-        if ip not in seen:
-            seen.add(ip)
-            unique_ips.append(ip)
+    # Per header, IPv4 addresses come before IPv6 ones. A separate IPv4
+    # pass also finds the embedded address of ::ffff:a.b.c.d literals.
+    for source in sources:
+        for match in _IPV4_WORD_RE.finditer(source):
+            yield match.group(0)
+        # No colon means no IPv6 candidates - skip that pass
+        if ":" in source:
+            for match in _IPV6_RE.finditer(source):
+                yield match.group(0)
 
-    return unique_ips
+
+def extract_ips(metadata):
+    """
+    Extract all IPv4 and IPv6 addresses from email metadata.
+
+    :param metadata: dict containing email metadata (from extract_metadata)
+    :return: list of IP address strings (may include private/loopback)
+    """
+    # Remove duplicates while preserving order
+    return list(dict.fromkeys(iter_ips(metadata)))
 
 
 def get_first_external_ip(ip_list):
     """
     Return the first public (non-private, non-loopback) IPv4 or IPv6 address from a list.
 
-    :param ip_list: list of IP address strings
+    :param ip_list: list (or any iterable, consumed lazily) of IP address strings
     :return: first external IP as string, or None if none found
     """
     for ip in ip_list or []:
-        try:
-            ip_obj = ipaddress.ip_address(ip)
-            # Skip private and loopback addresses
-            if not ip_obj.is_private and not ip_obj.is_loopback:
+        if _IPV4_RE.fullmatch(ip):
+            # Octets are already range-checked, fast integer path
+            if _is_public_ipv4(ip):
                 return ip
-        except ValueError:
+            continue
+
+        try:
+            is_public = _is_public_ipv6(ip)
+        except OSError:
             # Skip invalid IPs
             continue
+        # Skip private and loopback addresses
+        if is_public:
+            return ip
     return None
 
 
-def analyze_received_headers(msg: Message):
+def analyze_received_headers(msg: Message, include_all=True, metadata=None):
     """
     Analyze an email.Message to extract all IPs from metadata
     and identify the first external/public IP.
 
     :param msg: email.message.Message (or compatible) object
+    :param include_all: build the full "ips" list; when False the headers
+                        are only scanned up to the first public IP
+    :param metadata: optional analyzer.extract_metadata(msg) result, reused
+                     instead of extracting the headers again
     :return: dict with keys:
-             - "ips": list of all found IPs (may include private)
+             - "ips": list of all found IPs (may include private),
+                      only when include_all is True
              - "originating_ip": first public IP, or None
     """
-    from analyzer import extract_metadata
-    
-    metadata = extract_metadata(msg)
+    if metadata is None:
+        from analyzer import extract_metadata
+
+        metadata = extract_metadata(msg)
+
+    if not include_all:
+        return {"originating_ip": get_first_external_ip(iter_ips(metadata))}
+
     ips = extract_ips(metadata)
     originating_ip = get_first_external_ip(ips)
 
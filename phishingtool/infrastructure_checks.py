@@ -4,25 +4,37 @@ Analyzes email routing + infrastructure indicators
 Pure rule-based analysis
 """
 
-import re
-import ipaddress
+from parser import IP_RE, is_private_ipv4
 
 
 # --------------------------------------------------
 # Detect private IP presence in received headers
 # --------------------------------------------------
 def has_private_ip(received_headers):
-    for header in received_headers:
-        ips = re.findall(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', header)
+    return any(
+        is_private_ipv4(a, b, c, d)
+        for a, b, c, d in iter_unique_ipv4(received_headers)
+    )
+
+
+# --------------------------------------------------
+# Distinct valid IPv4 addresses (as int octets), lazily
+# --------------------------------------------------
+def iter_unique_ipv4(received_headers):
 
-        for ip in ips:
-            try:
-                if ipaddress.ip_address(ip).is_private:
-                    return True
-            except:
+    # Relays often repeat across Received headers; test each address once
+    seen = set()
+
+    for header in received_headers:
+        for octets in IP_RE.findall(header):
+            if octets in seen:
                 continue
+            seen.add(octets)
 
-    return False
+            a, b, c, d = map(int, octets)
+            if (a | b | c | d) >> 8:  # an octet above 255
+                continue
+            yield a, b, c, d
 
 
 # --------------------------------------------------
@@ -53,7 +65,10 @@ def relay_anomaly(received_count):
 # --------------------------------------------------
 # Main infrastructure analyzer
 # --------------------------------------------------
-def run_infrastructure_checks(metadata):
+def run_infrastructure_checks(metadata, private_ip_present=None):
+
+    # private_ip_present: optional flag from parser.extract_metadata's
+    # received_scan, so the Received headers are not scanned twice
 
     received_headers = metadata.get("received_headers", [])
     received_count = metadata.get("received_count", 0)
@@ -61,10 +76,26 @@ def run_infrastructure_checks(metadata):
     from_domain = metadata.get("from_domain")
     origin_ip = metadata.get("originating_ip")
 
+    # No Received headers: nothing to scan, and no HELO to compare against.
+    # A zero-hop message still counts as a relay anomaly (injected mail).
+    if not received_headers:
+        anomaly = relay_anomaly(received_count)
+        return {
+            "originating_ip": origin_ip,
+            "relay_count": received_count,
+            "private_ip_present": False,
+            "helo_mismatch": False,
+            "relay_anomaly": anomaly,
+            "infrastructure_suspicious": anomaly
+        }
+
+    if private_ip_present is None:
+        private_ip_present = has_private_ip(received_headers)
+
     results = {
         "originating_ip": origin_ip,
         "relay_count": received_count,
-        "private_ip_present": has_private_ip(received_headers),
+        "private_ip_present": private_ip_present,
         "helo_mismatch": helo_mismatch(helo, from_domain),
         "relay_anomaly": relay_anomaly(received_count)
     }
@@ -9,11 +9,12 @@ Pure structural analysis (no AI)
 # --------------------------------------------------
 
 
-def detect_encodings(msg):
+def detect_encodings(msg, parts=None):
 
     encodings = set()
 
-    for part in msg.walk():
+    # parts: optional precomputed list(msg.walk()) shared between checks
+    for part in (parts if parts is not None else msg.walk()):
         encoding = part.get("Content-Transfer-Encoding")
         if encoding:
             encodings.add(encoding.lower())
@@ -24,11 +25,14 @@ def detect_encodings(msg):
 # --------------------------------------------------
 # Count MIME parts
 # --------------------------------------------------
-def count_mime_parts(msg):
+def count_mime_parts(msg, parts=None):
 
     if not msg.is_multipart():
         return 1
 
+    if parts is not None:
+        return len(parts)
+
     return sum(1 for _ in msg.walk())
 
 
@@ -54,10 +58,14 @@ def is_multipart_email(msg):
 # --------------------------------------------------
 # Main MIME analyzer
 # --------------------------------------------------
-def run_mime_checks(msg):
+def run_mime_checks(msg, parts=None):
+
+    # Walk the MIME tree once for every check below
+    if parts is None:
+        parts = list(msg.walk())
 
-    encodings = detect_encodings(msg)
-    part_count = count_mime_parts(msg)
+    encodings = detect_encodings(msg, parts)
+    part_count = count_mime_parts(msg, parts)
     multipart_flag = is_multipart_email(msg)
 
     results = {
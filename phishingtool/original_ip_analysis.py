@@ -1,46 +1,171 @@
-from flask import Flask, request, jsonify
-from google import genai
-from google.genai import types
+import atexit
+import json
 import os
-from dotenv import load_dotenv
+import tempfile
+import threading
 
 
-# Load environment variables
-load_dotenv()
+# Gemini client, created on first use so importing this module stays cheap
+_client = None
 
-# Get API key from environment variable
-api_key = os.environ.get("API_KEY")
-if not api_key:
-    raise ValueError("API_KEY not found in environment variables. Please check your .env file.")
 
-# Initialize the client with API key
-client = genai.Client(api_key=api_key)
+def _get_client():
+    """
+    Return the shared Gemini client, loading .env and importing
+    google.genai the first time it is needed.
+    """
+    global _client
+    if _client is None:
+        from dotenv import load_dotenv
+        from google import genai
 
+        # Load environment variables
+        load_dotenv()
 
-def analyze_with_ai(originating_ip):
+        # Get API key from environment variable
+        api_key = os.environ.get("API_KEY")
+        if not api_key:
+            raise ValueError("API_KEY not found in environment variables. Please check your .env file.")
+
+        _client = genai.Client(api_key=api_key)
+    return _client
+
+
+MODEL = "gemini-2.0-flash"
+
+# Output cap for the single-IP yes/no reply. Leaves room for a stray
+# preamble or whitespace so a real "yes" is never cut off; the reply is
+# still parsed strictly.
+VERDICT_MAX_TOKENS = 16
+
+# Max IPs sent in one Gemini request by analyze_batch
+IP_BATCH_SIZE = max(1, int(os.environ.get("IP_BATCH_SIZE", "32")))
+
+# Verdict cache: ip -> (is_phishing, ai_response), shared by the single and
+# batch paths so repeat IPs never hit the API twice in one process
+_VERDICT_CACHE = {}
+MAX_CACHED_VERDICTS = 10000
+
+# Optional JSON file that persists verdicts across processes (unset = off).
+# New verdicts are flushed once per analyze_batch call and at exit, not on
+# every cache miss.
+VERDICT_CACHE_FILE = os.environ.get("IP_VERDICT_CACHE_FILE")
+_verdict_cache_loaded = False
+_verdict_cache_dirty = False
+_save_lock = threading.Lock()
+
+
+def _read_verdict_file():
+    """Return the verdicts stored in VERDICT_CACHE_FILE ({} if none)."""
+    if not VERDICT_CACHE_FILE or not os.path.exists(VERDICT_CACHE_FILE):
+        return {}
+    try:
+        with open(VERDICT_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read IP verdict cache: {e}")
+        return {}
+
+
+def _load_verdict_cache():
+    """Populate the in-memory cache from VERDICT_CACHE_FILE once per process."""
+    global _verdict_cache_loaded
+    if _verdict_cache_loaded:
+        return
+    _verdict_cache_loaded = True
+    if not VERDICT_CACHE_FILE:
+        return
+    atexit.register(_save_verdict_cache)
+    stored = _read_verdict_file()
+    for ip, (is_phishing, response_text) in list(stored.items())[-MAX_CACHED_VERDICTS:]:
+        _VERDICT_CACHE[ip] = (bool(is_phishing), response_text)
+
+
+def _save_verdict_cache():
     """
-    Analyze an originating IP using Gemini AI to determine if it's related to phishing.
+    Merge new verdicts into VERDICT_CACHE_FILE, if configured and anything
+    changed. The file is re-read first so verdicts written by other worker
+    processes are kept, and the result goes through a unique temp file and
+    os.replace so concurrent writers never interleave.
+    """
+    global _verdict_cache_dirty
+    if not VERDICT_CACHE_FILE or not _verdict_cache_dirty:
+        return
+    with _save_lock:
+        _verdict_cache_dirty = False
+        merged = _read_verdict_file()
+        merged.update(dict(_VERDICT_CACHE))
+        merged = dict(list(merged.items())[-MAX_CACHED_VERDICTS:])
 
-    :param originating_ip: the IP address to analyze
-    :return: dict with originating_ip and phishing result (True/False)
+        directory = os.path.dirname(os.path.abspath(VERDICT_CACHE_FILE))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(merged, f)
+                os.replace(tmp_path, VERDICT_CACHE_FILE)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            _verdict_cache_dirty = True
+            print(f"Could not write IP verdict cache: {e}")
+
+
+def _cache_verdict(ip, is_phishing, response_text):
+    global _verdict_cache_dirty
+    _verdict_cache_dirty = True
+    if len(_VERDICT_CACHE) >= MAX_CACHED_VERDICTS:
+        # Evict the oldest entry (dicts keep insertion order)
+        _VERDICT_CACHE.pop(next(iter(_VERDICT_CACHE)))
+    _VERDICT_CACHE[ip] = (is_phishing, response_text)
+
+
+def _gemini_ip_verdict(ip):
+    """
+    Cached Gemini yes/no verdict for a single IP.
+    Raises on API errors so failures are never cached.
+
+    :param ip: the IP address to classify
+    :return: (is_phishing, ai_response) tuple
     """
-    model = "gemini-2.0-flash"
+    _load_verdict_cache()
+    cached = _VERDICT_CACHE.get(ip)
+    if cached is not None:
+        return cached
+
+    from google.genai import types
+
     contents = [
-        types.Content(role="user", parts=[types.Part.from_text(text=f"Please tell me if the following ip address is related to phishing through emails.\nip:\n{originating_ip}\n\nAnswer only in yes or no in lower case")]), 
+        types.Content(role="user", parts=[types.Part.from_text(text=f"Please tell me if the following ip address is related to phishing through emails.\nip:\n{ip}\n\nAnswer only in yes or no in lower case")]), 
     ]
 
-    generate_content_config = types.GenerateContentConfig()
+    # The answer is a single word, so cap the output and skip streaming
+    generate_content_config = types.GenerateContentConfig(
+        max_output_tokens=VERDICT_MAX_TOKENS
+    )
+
+    response = _get_client().models.generate_content(
+        model=MODEL, contents=contents, config=generate_content_config
+    )
+    response_text = response.text or ""
 
-    response_text = ""
+    _cache_verdict(ip, response_text.lower().strip() == 'yes', response_text)
+    return _VERDICT_CACHE[ip]
+
+
+def analyze_with_ai(originating_ip):
+    """
+    Analyze an originating IP using Gemini AI to determine if it's related to phishing.
+    Results are cached per IP (and on disk when IP_VERDICT_CACHE_FILE is set).
+
+    :param originating_ip: the IP address to analyze
+    :return: dict with originating_ip and phishing result (True/False)
+    """
     try:
-        for chunk in client.models.generate_content_stream(
-            model=model, contents=contents, config=generate_content_config
-        ):
-            response_text += chunk.text
+        is_phishing, response_text = _gemini_ip_verdict(originating_ip)
     except Exception as e:
         return {"error": str(e)}
-    
-    is_phishing = response_text.lower().strip() == 'yes'
 
     return {
         "originating_ip": originating_ip,
@@ -49,13 +174,89 @@ def analyze_with_ai(originating_ip):
     }
 
 
+def analyze_batch(ips):
+    """
+    Classify several IPs with as few Gemini requests as possible
+    (IP_BATCH_SIZE per request). Cached IPs are answered locally;
+    only the rest are sent.
+
+    IPs the batch reply left unanswered (e.g. a reply with the wrong number
+    of lines) are retried one at a time with _gemini_ip_verdict.
+
+    :param ips: list of IP address strings
+    :return: dict mapping each IP to True (phishing) / False, or to
+             {"error": ...} if that IP could not be classified;
+             {"error": ...} overall if a batch request failed
+    """
+    _load_verdict_cache()
+    pending = [ip for ip in dict.fromkeys(ips) if ip not in _VERDICT_CACHE]
+
+    for start in range(0, len(pending), IP_BATCH_SIZE):
+        error = _request_batch(pending[start:start + IP_BATCH_SIZE])
+        if error:
+            _save_verdict_cache()
+            return {"error": error}
+
+    results = {}
+    for ip in ips:
+        if ip in results:
+            continue
+        try:
+            results[ip] = _gemini_ip_verdict(ip)[0]
+        except Exception as e:
+            # Never report an unclassified IP as "not phishing"
+            results[ip] = {"error": str(e)}
+    _save_verdict_cache()
+    return results
+
+
+def _request_batch(batch):
+    """
+    Send one numbered yes/no prompt for a batch of uncached IPs and cache
+    the answers.
+
+    :param batch: list of IP address strings (at most IP_BATCH_SIZE)
+    :return: error message, or None on success
+    """
+    from google.genai import types
+
+    ip_lines = "\n".join(f"{i}. {ip}" for i, ip in enumerate(batch, 1))
+    contents = [
+        types.Content(role="user", parts=[types.Part.from_text(text=f"Please tell me if each of the following ip addresses is related to phishing through emails.\nips:\n{ip_lines}\n\nAnswer with one line per ip, in the same order, containing only yes or no in lower case")]),
+    ]
+    generate_content_config = types.GenerateContentConfig(
+        max_output_tokens=4 * len(batch)
+    )
+
+    try:
+        response = _get_client().models.generate_content(
+            model=MODEL, contents=contents, config=generate_content_config
+        )
+        response_text = response.text or ""
+    except Exception as e:
+        return str(e)
+
+    answers = [line.strip() for line in response_text.splitlines() if line.strip()]
+    # Only cache when the model answered every IP, so lines can't be misaligned
+    if len(answers) == len(batch):
+        for ip, answer in zip(batch, answers):
+            # Tolerate numbered answers such as "1. yes"
+            answer = answer.split()[-1].lower()
+            _cache_verdict(ip, answer == 'yes', answer)
+    return None
+
+
 def analyze(data):
     """
     Analyze email data with IPs using AI.
 
-    :param data: dict with 'ips' and 'originating_ip' keys
-    :return: analysis result
+    :param data: dict with 'ips' and 'originating_ip' keys, or a list of
+                 IP strings to classify in batches
+    :return: analysis result (a {ip: bool} dict for list input)
     """
+    if isinstance(data, (list, tuple)):
+        return analyze_batch(data)
+
     ips = data.get('ips', '')
     original = data.get('originating_ip', '')
 
@@ -1,14 +1,51 @@
 from email import policy
-from email.parser import BytesParser
+from email.parser import BytesParser, Parser
 from email.utils import parseaddr
 import sys
+import os
 import re
+import mmap
 import hashlib
+import binascii
 from urllib.parse import urlparse
-import ipaddress
 
 sys.stdout.reconfigure(encoding='utf-8')
 
+# Attachments are hashed in chunks of this many base64 characters
+HASH_CHUNK_CHARS = 64 * 1024
+
+# Files at least this large are memory-mapped instead of streamed
+MMAP_THRESHOLD_BYTES = 64 * 1024
+
+# Shared parsers (stateless between calls, so one instance serves every email)
+_PARSER = BytesParser(policy=policy.default)
+_TEXT_PARSER = Parser(policy=policy.default)
+
+# Precompiled patterns used on every Received header.
+# IP_RE captures the four octets; leading zeros never match, since
+# ipaddress rejects them too.
+_OCTET = r'(0|[1-9][0-9]{0,2})'
+IP_RE = re.compile(rf'\b{_OCTET}\.{_OCTET}\.{_OCTET}\.{_OCTET}\b')
+HELO_RE = re.compile(r'helo=([^\s;]+)', re.IGNORECASE)
+
+# http(s):// or www. URLs in a body
+URL_RE = re.compile(r'https?://[^\s<>"\'()]+|www\.[^\s<>"\'()]+')
+
+# "Display Name <user@host>" or bare "user@host" with no RFC 5322 specials;
+# anything else is left to parseaddr
+_ADDR_ATOM = r'[^\s"(),:;<>\[\]\\@]+'
+_SIMPLE_ADDR_RE = re.compile(
+    rf'\s*(?:(?:"[^"\\]*"|[^"(),:;<>\[\]\\@]*)<({_ADDR_ATOM}@{_ADDR_ATOM})>'
+    rf'|({_ADDR_ATOM}@{_ADDR_ATOM}))\s*'
+)
+
+# HELO or IPv4 in one pattern. The HELO branch is a lookahead so it doesn't
+# consume text, which keeps IPs inside "helo=[...]" visible to the IP branch.
+RECEIVED_RE = re.compile(
+    rf'(?=helo=([^\s;]+))|\b{_OCTET}\.{_OCTET}\.{_OCTET}\.{_OCTET}\b',
+    re.IGNORECASE
+)
+
 
 # -------------------------------
 # Helper: Extract domain safely
@@ -16,7 +53,15 @@ sys.stdout.reconfigure(encoding='utf-8')
 def extract_domain(address):
     if not address:
         return None
-    name, email_addr = parseaddr(address)
+
+    # Fast paths for the common shapes ("Name <user@host>" and a bare
+    # "user@host"); anything unusual goes through the full parseaddr
+    match = _SIMPLE_ADDR_RE.fullmatch(address)
+    if match:
+        email_addr = match.group(1) or match.group(2)
+    else:
+        name, email_addr = parseaddr(address)
+
     if "@" in email_addr:
         return email_addr.split("@")[-1].lower().strip()
     return None
@@ -36,17 +81,64 @@ def extract_message_id_domain(message_id):
 # -------------------------------
 def extract_origin_ip(received_headers):
     for header in received_headers:
-        ips = re.findall(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', header)
-        for ip in ips:
-            try:
-                ip_obj = ipaddress.ip_address(ip)
-                if not ip_obj.is_private:
-                    return ip
-            except:
+        for octets in IP_RE.findall(header):
+            a, b, c, d = map(int, octets)
+            if (a | b | c | d) >> 8:  # an octet above 255
                 continue
+            if not is_private_ipv4(a, b, c, d):
+                return ".".join(octets)
     return None
 
 
+# -------------------------------
+# Helper: Scan Received headers once
+# -------------------------------
+def _scan_received(received_headers):
+    # Origin IP, HELO and private-IP presence from a single pass
+    origin_ip = None
+    helo = None
+    private_ip_present = False
+
+    for header in received_headers:
+        for match in RECEIVED_RE.finditer(header):
+            if match.group(1) is not None:
+                if helo is None:
+                    helo = match.group(1)
+                continue
+
+            a, b, c, d = map(int, match.groups()[1:])
+            if (a | b | c | d) >> 8:  # an octet above 255
+                continue
+            if is_private_ipv4(a, b, c, d):
+                private_ip_present = True
+            elif origin_ip is None:
+                origin_ip = match.group(0)
+
+    return {
+        "origin_ip": origin_ip,
+        "helo": helo,
+        "private_ip_present": private_ip_present
+    }
+
+
+# -------------------------------
+# Helper: Private IPv4 check on octets
+# -------------------------------
+def is_private_ipv4(a, b, c, d):
+    # Same ranges as ipaddress.IPv4Address.is_private, without building
+    # an address object per IP
+    return (
+        a == 10 or a == 127 or a == 0 or a >= 240
+        or (a == 172 and 16 <= b <= 31)
+        or (a == 192 and b == 168)
+        or (a == 169 and b == 254)
+        or (a == 198 and (b == 18 or b == 19))
+        or (a == 192 and b == 0 and (c == 2 or (c == 0 and (d < 8 or d == 170 or d == 171))))
+        or (a == 198 and b == 51 and c == 100)
+        or (a == 203 and b == 0 and c == 113)
+    )
+
+
 # -------------------------------
 # Helper: Parse Authentication-Results
 # -------------------------------
@@ -60,18 +152,18 @@ def parse_authentication(auth_header):
     if not auth_header:
         return results
 
-    if "spf=" in auth_header:
-        results["spf"] = re.search(r'spf=(\w+)', auth_header)
-        results["spf"] = results["spf"].group(1) if results["spf"] else None
-
-    if "dkim=" in auth_header:
-        results["dkim"] = re.search(r'dkim=(\w+)', auth_header)
-        results["dkim"] = results["dkim"].group(1) if results["dkim"] else None
-
-    if "dmarc=" in auth_header:
-        results["dmarc"] = re.search(r'dmarc=(\w+)', auth_header)
-        results["dmarc"] = results["dmarc"].group(
-            1) if results["dmarc"] else None
+    # RFC 8601: "authserv-id; method=result [props] [(comment)]; ..."
+    # One split on ";" and "=" per clause; the first result for each method wins
+    for clause in auth_header.split(";"):
+        method, sep, value = clause.partition("=")
+        if not sep:
+            continue
+        method = method.strip().lower()
+        if method in results and results[method] is None:
+            value = value.split(None, 1)[0] if value.strip() else ""
+            value = value.partition("(")[0]
+            if value:
+                results[method] = value
 
     return results
 
@@ -81,31 +173,71 @@ def parse_authentication(auth_header):
 # -------------------------------
 def load_email(file):
     with open(file, "rb") as f:
-        msg = BytesParser(policy=policy.default).parse(f)
-    return msg
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD_BYTES:
+            return _PARSER.parse(f)
+
+        # Decode straight out of the mapping, skipping the buffered read loop
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "ascii", "surrogateescape")
+
+    # Same universal-newline translation the stream path gets from TextIOWrapper
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return _TEXT_PARSER.parsestr(text)
+
+
+# -------------------------------
+# Helper: Index headers in one pass
+# -------------------------------
+_METADATA_HEADERS = frozenset({
+    "from", "to", "cc", "bcc", "subject", "date", "reply-to",
+    "return-path", "message-id", "mime-version", "x-mailer",
+    "user-agent", "received", "authentication-results"
+})
+
+
+def index_headers(msg, names=_METADATA_HEADERS):
+    # msg.get() rescans every header per lookup; walk the raw headers once
+    # and only run the policy's (expensive) parse for the ones we keep
+    fetch = msg.policy.header_fetch_parse
+    headers = {}
+    for name, value in msg.raw_items():
+        key = name.lower()
+        if key in names:
+            headers.setdefault(key, []).append(fetch(name, value))
+    return headers
 
 
 # -------------------------------
 # Extract Metadata
 # -------------------------------
-def extract_metadata(msg):
-    received_headers = msg.get_all("Received") or []
-    auth_header = msg.get("Authentication-Results")
+def extract_metadata(msg, received_scan=None):
+    # received_scan, if given, is filled with the Received scan results
+    # (origin_ip, helo, private_ip_present) so callers such as
+    # infrastructure_checks.run_infrastructure_checks can reuse them
+    headers = index_headers(msg)
+
+    def first(name):
+        values = headers.get(name)
+        return values[0] if values else None
+
+    received_headers = headers.get("received", [])
+    auth_header = first("authentication-results")
 
     metadata = {
-        "from": msg.get("From"),
-        "to": msg.get("To"),
-        "cc": msg.get("Cc"),
-        "bcc": msg.get("Bcc"),
-        "subject": msg.get("Subject"),
-        "date": msg.get("Date"),
-        "reply_to": msg.get("Reply-To"),
-        "return_path": msg.get("Return-Path"),
-        "message_id": msg.get("Message-ID"),
-        "mime_version": msg.get("MIME-Version"),
+        "from": first("from"),
+        "to": first("to"),
+        "cc": first("cc"),
+        "bcc": first("bcc"),
+        "subject": first("subject"),
+        "date": first("date"),
+        "reply_to": first("reply-to"),
+        "return_path": first("return-path"),
+        "message_id": first("message-id"),
+        "mime_version": first("mime-version"),
         "content_type": msg.get_content_type(),
-        "x_mailer": msg.get("X-Mailer"),
-        "user_agent": msg.get("User-Agent"),
+        "x_mailer": first("x-mailer"),
+        "user_agent": first("user-agent"),
         "received_headers": received_headers,
         "received_count": len(received_headers),
     }
@@ -120,17 +252,12 @@ def extract_metadata(msg):
     # Authentication
     metadata["authentication"] = parse_authentication(auth_header)
 
-    # Origin IP
-    metadata["originating_ip"] = extract_origin_ip(received_headers)
-
-    # HELO extraction
-    helo_match = None
-    for header in received_headers:
-        match = re.search(r'helo=([^\s;]+)', header, re.IGNORECASE)
-        if match:
-            helo_match = match.group(1)
-            break
-    metadata["helo"] = helo_match
+    # Origin IP, HELO and private IP flag (one pass over Received)
+    received = _scan_received(received_headers)
+    metadata["originating_ip"] = received["origin_ip"]
+    metadata["helo"] = received["helo"]
+    if received_scan is not None:
+        received_scan.update(received)
 
     # Domain mismatch checks
     metadata["reply_to_mismatch"] = (
@@ -157,33 +284,81 @@ def extract_metadata(msg):
 # -------------------------------
 # Decode Body
 # -------------------------------
+def decode_text_part(part):
+    # Decode the transfer encoding once and apply the declared charset
+    # directly, skipping the content manager dispatch of get_content()
+    raw = part.get_payload(decode=True)
+    if not raw:
+        return ""
+    charset = part.get_content_charset() or "utf-8"
+    try:
+        return raw.decode(charset, errors="replace")
+    except LookupError:
+        # Unknown charset label
+        return raw.decode("utf-8", errors="replace")
+
+
+def iter_body_parts(msg):
+    # Lazily yields decoded text/plain and text/html bodies in MIME order
+    for part in msg.walk():
+        if part.get_content_disposition() == "attachment":
+            continue
+        if part.get_content_type() in ("text/plain", "text/html"):
+            yield decode_text_part(part)
+
+
 def decode_body(msg):
-    body = ""
     if msg.is_multipart():
-        for part in msg.walk():
-            if part.get_content_disposition() == "attachment":
-                continue
-            if part.get_content_type() in ["text/plain", "text/html"]:
-                body += part.get_content()
-    else:
-        body = msg.get_content()
-    return body
+        return "".join(iter_body_parts(msg))
+    return msg.get_content()
+
+
+# -------------------------------
+# Helper: Size + SHA-256 of an attachment
+# -------------------------------
+def _hash_attachment(part):
+    # Base64 payloads are decoded and hashed chunk by chunk, so the full
+    # decoded attachment is never held in memory alongside its encoded form
+    raw = part.get_payload()
+    cte = (part.get("Content-Transfer-Encoding") or "").strip().lower()
+
+    if cte == "base64" and isinstance(raw, str):
+        hasher = hashlib.sha256()
+        size = 0
+        pending = ""
+        try:
+            for start in range(0, len(raw), HASH_CHUNK_CHARS):
+                data = pending + "".join(raw[start:start + HASH_CHUNK_CHARS].split())
+                cut = len(data) - len(data) % 4
+                pending = data[cut:]
+                chunk = binascii.a2b_base64(data[:cut])
+                hasher.update(chunk)
+                size += len(chunk)
+            if pending:
+                raise binascii.Error("truncated base64 payload")
+        except (binascii.Error, ValueError):
+            # Malformed base64: let the email package decode it leniently
+            pass
+        else:
+            return size, hasher.hexdigest() if size else None
+
+    payload = part.get_payload(decode=True)
+    if not payload:
+        return 0, None
+    return len(payload), hashlib.sha256(payload).hexdigest()
 
 
 # -------------------------------
 # Extract Attachments
 # -------------------------------
-def extract_attachments(msg):
+def extract_attachments(msg, parts=None):
     attachments = []
 
-    for part in msg.walk():
+    # parts: optional precomputed list(msg.walk())
+    for part in (parts if parts is not None else msg.walk()):
         if part.get_content_disposition() == "attachment":
-            payload = part.get_payload(decode=True)
             filename = part.get_filename()
-            size = len(payload) if payload else 0
-
-            sha256_hash = hashlib.sha256(
-                payload).hexdigest() if payload else None
+            size, sha256_hash = _hash_attachment(part)
 
             attachments.append({
                 "filename": filename,
@@ -202,11 +377,9 @@ def extract_urls(body):
     if not body:
         return []
 
-    url_pattern = r'(https?://[^\s<>"\'()]+|www\.[^\s<>"\'()]+)'
-    found_urls = re.findall(url_pattern, body)
-
     urls = []
-    for url in found_urls:
+    for match in URL_RE.finditer(body):
+        url = match.group(0)
         if not url.startswith("http"):
             url = "http://" + url
 
@@ -227,11 +400,12 @@ def extract_urls(body):
 # -------------------------------
 def analyze_email(file):
     msg = load_email(file)
+    parts = list(msg.walk())
 
     metadata = extract_metadata(msg)
     body = decode_body(msg)
     urls = extract_urls(body)
-    attachments = extract_attachments(msg)
+    attachments = extract_attachments(msg, parts)
 
     return {
         "metadata": metadata,
@@ -6,31 +6,43 @@ Measures time spent in each component to identify bottlenecks
 import sys
 import os
 import time
+from contextlib import contextmanager
 from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
 
-# Store timing data
+# Store timing data: component -> {'total_ns': nanoseconds, 'count': calls}
 timings = {}
 
 
+@contextmanager
+def timer(component_name):
+    """Context manager measuring the time spent in its block"""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        # Running aggregates keep the report O(components)
+        stats = timings.setdefault(component_name, {'total_ns': 0, 'count': 0})
+        stats['total_ns'] += time.perf_counter_ns() - start
+        stats['count'] += 1
+
+
 def time_it(component_name):
     """Decorator to measure execution time of functions"""
     def decorator(func):
         def wrapper(*args, **kwargs):
-            start = time.time()
-            result = func(*args, **kwargs)
-            elapsed = time.time() - start
-            
-            if component_name not in timings:
-                timings[component_name] = []
-            timings[component_name].append(elapsed)
-            
-            return result
+            with timer(component_name):
+                return func(*args, **kwargs)
         return wrapper
     return decorator
 
 
+def _seconds(component_name):
+    """Total seconds recorded for a component"""
+    return timings[component_name]['total_ns'] / 1e9
+
+
 def print_timing_report():
     """Print a formatted timing report"""
     print("\n" + "=" * 70)
@@ -38,28 +50,29 @@ def print_timing_report():
     print("=" * 70)
     
     # Calculate totals
-    total_time = sum(sum(times) for times in timings.values())
+    total_time = sum(stats['total_ns'] for stats in timings.values()) / 1e9
     
     # Sort by total time
     sorted_components = sorted(
         timings.items(),
-        key=lambda x: sum(x[1]),
+        key=lambda x: x[1]['total_ns'],
         reverse=True
     )
     
     print(f"\n📊 TOTAL ANALYSIS TIME: {total_time:.3f} seconds\n")
     
     # Display each component
-    for component, times in sorted_components:
-        total = sum(times)
-        avg = total / len(times)
+    for component, stats in sorted_components:
+        total = stats['total_ns'] / 1e9
+        count = stats['count']
+        avg = total / count
         percentage = (total / total_time) * 100 if total_time > 0 else 0
         
         bar_length = int(percentage / 2)
         bar = "█" * bar_length + "░" * (50 - bar_length)
         
         print(f"{component:40} {percentage:5.1f}% [{bar}]")
-        print(f"{'':40} Total: {total:.3f}s | Avg: {avg:.3f}s | Calls: {len(times)}")
+        print(f"{'':40} Total: {total:.3f}s | Avg: {avg:.3f}s | Calls: {count}")
         print()
     
     print("=" * 70)
@@ -67,31 +80,31 @@ def print_timing_report():
     
     # Analyze bottlenecks
     if timings.get('ML URL Authenticity Analysis'):
-        ml_time = sum(timings['ML URL Authenticity Analysis'])
+        ml_time = _seconds('ML URL Authenticity Analysis')
         if ml_time / total_time > 0.3:
             print("  ⚠️  ML URL analysis is taking >30% of time - consider GPU acceleration or model optimization")
         else:
             print(f"  ✅ ML URL analysis is efficient (~{(ml_time/total_time)*100:.1f}% of total time)")
     
     if timings.get('DNS/SPF/DMARC/DKIM Checks (Cached)'):
-        dns_time = sum(timings['DNS/SPF/DMARC/DKIM Checks (Cached)'])
+        dns_time = _seconds('DNS/SPF/DMARC/DKIM Checks (Cached)')
         if dns_time / total_time > 0.2:
             print(f"  📌 DNS checks are using {(dns_time/total_time)*100:.1f}% of time (now cached and minimal)")
     
     if timings.get('Hugging Face Model Inference'):
-        model_time = sum(timings['Hugging Face Model Inference'])
+        model_time = _seconds('Hugging Face Model Inference')
         if model_time / total_time > 0.3:
             print("  ⚠️  Email body model inference is taking >30% of time - consider quantization")
     
     if timings.get('Email Parsing'):
-        parse_time = sum(timings['Email Parsing'])
+        parse_time = _seconds('Email Parsing')
         if parse_time / total_time > 0.2:
             print("  📌 Email parsing completed efficiently")
     
     # Performance improvement message
     if timings.get('ML URL Authenticity Analysis') and timings.get('DNS/SPF/DMARC/DKIM Checks (Cached)'):
-        ml_time = sum(timings.get('ML URL Authenticity Analysis', []))
-        dns_time = sum(timings.get('DNS/SPF/DMARC/DKIM Checks (Cached)', []))
+        ml_time = _seconds('ML URL Authenticity Analysis')
+        dns_time = _seconds('DNS/SPF/DMARC/DKIM Checks (Cached)')
         improvement = ((dns_time - ml_time) / dns_time) * 100 if dns_time > 0 else 0
         if improvement > 0:
             print(f"\n  🚀 ML URL Analysis provides ~{improvement:.1f}% speedup over traditional DNS lookups")
@@ -103,73 +116,50 @@ def profile_full_analysis(email_file='email2.eml'):
     print("\n🚀 Starting Performance Profiling...\n")
     
     # ========== EMAIL PARSING ==========
-    @time_it('Email Parsing')
-    def parse_email():
+    with timer('Email Parsing'):
         from analyzer import load_email, analyze_email
         msg = load_email(email_file)
-        result = analyze_email(email_file)
-        return msg, result
-    
-    msg, email_result = parse_email()
+        email_result = analyze_email(email_file)
     
     # ========== IP ANALYSIS ==========
-    @time_it('IP Analysis (Received Headers)')
-    def analyze_ip():
+    with timer('IP Analysis (Received Headers)'):
         from infrastructure_analysis import analyze_received_headers
-        return analyze_received_headers(msg)
-    
-    ip_analysis = analyze_ip()
+        ip_analysis = analyze_received_headers(msg)
     
     # ========== URL EXTRACTION ==========
-    @time_it('URL Extraction')
-    def extract_urls():
+    with timer('URL Extraction'):
         from url_analyzer import extract_urls
-        return extract_urls(email_result.get("body", ""))
-    
-    urls = extract_urls()
+        urls = extract_urls(email_result.get("body", ""))
     
     # ========== ML-BASED URL AUTHENTICITY ANALYSIS ==========
     if urls:
-        @time_it('ML URL Authenticity Analysis')
-        def analyze_urls_with_ml():
+        with timer('ML URL Authenticity Analysis'):
             from url_ml_analyzer import analyze_urls_with_ml_parallel
-            return analyze_urls_with_ml_parallel(urls)
-        
-        ml_url_results = analyze_urls_with_ml()
+            ml_url_results = analyze_urls_with_ml_parallel(urls)
     
     # ========== DNS/SPF/DMARC/DKIM CHECKS (Cached) ==========
     if urls:
-        @time_it('DNS/SPF/DMARC/DKIM Checks (Cached)')
-        def dns_checks():
+        with timer('DNS/SPF/DMARC/DKIM Checks (Cached)'):
             from url_analyzer import has_spf, has_dmarc, has_dkim, get_domain
             domains = list(set([get_domain(url) for url in urls]))
-            results = []
+            dns_results = []
             for domain in domains:
-                results.append({
+                dns_results.append({
                     'domain': domain,
                     'spf': has_spf(domain),
                     'dmarc': has_dmarc(domain),
                     'dkim': has_dkim(domain)
                 })
-            return results
-        
-        dns_results = dns_checks()
     
     # ========== TRANSFORMER MODEL ==========
-    @time_it('Hugging Face Model Inference')
-    def run_transformer():
+    with timer('Hugging Face Model Inference'):
         from huggingface_analyzer import analyze_email_body_with_transformers
-        return analyze_email_body_with_transformers(email_result.get("body", ""))
-    
-    transformer_result = run_transformer()
+        transformer_result = analyze_email_body_with_transformers(email_result.get("body", ""))
     
     # ========== SCORE CALCULATION ==========
-    @time_it('Score Calculation')
-    def calculate_scores():
+    with timer('Score Calculation'):
         from score_calculator import calculate_phishing_score
-        return calculate_phishing_score(email_result, ip_analysis)
-    
-    phishing_score = calculate_scores()
+        phishing_score = calculate_phishing_score(email_result, ip_analysis)
     
     # Print results
     print_timing_report()
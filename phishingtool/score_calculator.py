@@ -6,8 +6,123 @@ header_checks, infrastructure_checks, mime_checks, timing_checks, url_checks,
 huggingface_analyzer, url_ml_analyzer, and infrastructure_analysis.
 """
 
+import bisect
+import hashlib
 import json
+import logging
+import math
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlparse
+
+# orjson is optional; save_to_json falls back to the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rule-based check modules are pure Python with no heavy dependencies,
+# so import them once here rather than on every score call
+from auth_checks import parse_authentication_results
+from header_checks import (
+    missing_required_headers, invalid_message_id, scan_header_values
+)
+from domain_checks import has_suspicious_tld, looks_like_spoofed
+from infrastructure_checks import has_private_ip, helo_mismatch, relay_anomaly
+from mime_checks import detect_encodings, count_mime_parts, suspicious_encoding
+from timing_checks import (
+    extract_timestamps, has_time_travel, total_delivery_time, suspicious_delivery
+)
+from url_checks import (
+    is_ip_url, has_suspicious_tld as url_has_suspicious_tld, is_long_url,
+    too_many_subdomains, is_insecure_scheme
+)
+from analyzer import analyze_email, load_email
+from infrastructure_analysis import analyze_received_headers
+
+logger = logging.getLogger(__name__)
+
+# url_analyzer needs dnspython; without it only URL scoring is unavailable
+try:
+    from url_analyzer import (
+        extract_urls, has_spf, has_dmarc, has_dkim
+    )
+    _url_analyzer_error = None
+except ImportError as e:
+    _url_analyzer_error = e
+    logger.warning("URL scoring disabled, url_analyzer unavailable: %s", e)
+
+# huggingface_analyzer and url_ml_analyzer load model weights on import,
+# so they stay lazy (see warmup_models)
+
+# Attachment scores per message object, dropped with the message
+_attachment_scores = weakref.WeakKeyDictionary()
+
+# Upper bound on concurrent SPF/DMARC/DKIM lookups per email
+MAX_DNS_WORKERS = 16
+
+# X-Mailer tokens that mark an unusual mailer (add alternatives with |)
+_SUSPICIOUS_MAILERS = re.compile(r"unknown", re.IGNORECASE)
+
+# Component score names, in the order they are reported, and the weight
+# each gets in the overall score. The weights add up to 94%, so a perfect
+# 10 in every component gives 9.4; kept as-is so existing scores and risk
+# levels don't shift.
+_SCORE_KEYS = (
+    "attachment_score", "authentication_score", "header_score",
+    "domain_score", "url_score", "infrastructure_score", "mime_score",
+    "timing_score", "metadata_score", "ip_analysis_score",
+    "url_security_score", "transformer_score"
+)
+_WEIGHTS = (
+    0.08,   # attachment
+    0.12,   # authentication
+    0.08,   # header
+    0.10,   # domain
+    0.08,   # url
+    0.08,   # infrastructure
+    0.06,   # mime
+    0.06,   # timing
+    0.08,   # metadata
+    0.07,   # ip analysis
+    0.10,   # url security
+    0.03    # transformer
+)
+assert len(_WEIGHTS) == len(_SCORE_KEYS)
+
+# Bounded LRU caches for the model-backed scores. Bulk mail repeats the
+# same body (and the same links) many times; identical input, same score.
+MODEL_CACHE_MAXSIZE = 10000
+_transformer_cache = OrderedDict()   # blake2b(body) -> score
+_url_ml_cache = OrderedDict()        # tuple(urls) -> ML URL score
+_model_cache_lock = threading.Lock()
+
+
+def _cache_get(cache, key):
+    with _model_cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_set(cache, key, value):
+    with _model_cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > MODEL_CACHE_MAXSIZE:
+            cache.popitem(last=False)
+
+
+def _body_key(email_body):
+    """Short content digest used as the transformer cache key"""
+    return hashlib.blake2b(
+        email_body.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
 
 
 # ============================================================
@@ -20,6 +135,10 @@ def calculate_attachment_score(msg):
     :param msg: email message object
     :return: score (0-10)
     """
+    cached = _attachment_scores.get(msg)
+    if cached is not None:
+        return cached
+    
     try:
         from attachment_checks import (
             get_extension, has_double_extension, is_executable, 
@@ -51,9 +170,11 @@ def calculate_attachment_score(msg):
             if ext and is_archive(ext):
                 score += 1.5
         
-        return min(score, 10)
+        score = min(score, 10)
+        _attachment_scores[msg] = score
+        return score
     except Exception as e:
-        print(f"Attachment check error: {e}")
+        logger.warning("Attachment check error: %s", e)
         return 0
 
 
@@ -69,8 +190,6 @@ def calculate_auth_score(msg, metadata):
     :return: score (0-10)
     """
     try:
-        from auth_checks import parse_authentication_results
-        
         score = 0
         auth_header = msg.get("Authentication-Results", "")
         auth_results = parse_authentication_results(auth_header)
@@ -99,7 +218,7 @@ def calculate_auth_score(msg, metadata):
         
         return min(score, 10)
     except Exception as e:
-        print(f"Auth check error: {e}")
+        logger.warning("Auth check error: %s", e)
         return 0
 
 
@@ -114,19 +233,14 @@ def calculate_header_score(metadata):
     :return: score (0-10)
     """
     try:
-        from header_checks import (
-            missing_required_headers, duplicate_headers, 
-            invalid_message_id, unusually_long_headers
-        )
-        
         score = 0
         
         # Missing required headers
         missing = missing_required_headers(metadata)
         score += len(missing) * 0.5
         
-        # Duplicate headers
-        duplicates = duplicate_headers(metadata)
+        # Duplicate and unusually long headers (one pass over metadata)
+        duplicates, long_headers = scan_header_values(metadata)
         score += len(duplicates) * 1.5
         
         # Invalid Message-ID
@@ -134,12 +248,11 @@ def calculate_header_score(metadata):
             score += 1.5
         
         # Unusually long headers
-        long_headers = unusually_long_headers(metadata)
         score += len(long_headers) * 1
         
         return min(score, 10)
     except Exception as e:
-        print(f"Header check error: {e}")
+        logger.warning("Header check error: %s", e)
         return 0
 
 
@@ -154,8 +267,6 @@ def calculate_domain_score(metadata):
     :return: score (0-10)
     """
     try:
-        from domain_checks import has_suspicious_tld, looks_like_spoofed
-        
         score = 0
         from_domain = metadata.get("from_domain", "")
         return_path_domain = metadata.get("return_path_domain", "")
@@ -180,41 +291,52 @@ def calculate_domain_score(metadata):
         
         return min(score, 10)
     except Exception as e:
-        print(f"Domain check error: {e}")
+        logger.warning("Domain check error: %s", e)
         return 0
 
 
 # ============================================================
 # URL SCORING
 # ============================================================
-def calculate_url_score(email_body):
+def _parse_body_urls(email_body):
+    """
+    Extract the body's URLs and parse each one once, for sharing between
+    calculate_url_score and calculate_url_security_score.
+    
+    :param email_body: email body text
+    :return: tuple (urls, parsed urls, domains), three parallel lists
+    """
+    urls = extract_urls(email_body)
+    parsed = [urlparse(url) for url in urls]
+    # Same value get_domain() returns, without parsing the URL again
+    domains = [(p.hostname or "").lower() for p in parsed]
+    return urls, parsed, domains
+
+
+def calculate_url_score(email_body, parsed_urls=None):
     """
     Calculate phishing score based on URL checks.
     
     :param email_body: email body text
+    :param parsed_urls: optional precomputed _parse_body_urls(email_body)
     :return: score (0-10)
     """
+    if _url_analyzer_error:
+        return 0
+    
     try:
-        from url_analyzer import extract_urls, get_domain
-        from url_checks import (
-            is_ip_url, has_suspicious_tld, is_long_url, 
-            too_many_subdomains, is_insecure_scheme
-        )
-        from urllib.parse import urlparse
-        
         score = 0
-        urls = extract_urls(email_body)
+        if parsed_urls is None:
+            parsed_urls = _parse_body_urls(email_body)
+        urls, parsed_list, domains = parsed_urls
         
-        for url in urls:
-            parsed = urlparse(url)
-            domain = get_domain(url) if get_domain else parsed.netloc
-            
+        for url, parsed, domain in zip(urls, parsed_list, domains):
             # IP-based URL
             if is_ip_url(domain):
                 score += 2
             
             # Suspicious TLD
-            if has_suspicious_tld(domain):
+            if url_has_suspicious_tld(domain):
                 score += 1.5
             
             # Long URL (could hide actual destination)
@@ -231,28 +353,26 @@ def calculate_url_score(email_body):
         
         return min(score, 10)
     except Exception as e:
-        print(f"URL check error: {e}")
+        logger.warning("URL check error: %s", e)
         return 0
 
 
 # ============================================================
 # INFRASTRUCTURE SCORING
 # ============================================================
-def calculate_infrastructure_score(msg, metadata):
+def calculate_infrastructure_score(msg, metadata, received_headers=None):
     """
     Calculate phishing score based on infrastructure analysis.
     
     :param msg: email message object
     :param metadata: email metadata dict
+    :param received_headers: optional precomputed msg.get_all("Received") list
     :return: score (0-10)
     """
     try:
-        from infrastructure_checks import (
-            has_private_ip, helo_mismatch, relay_anomaly
-        )
-        
         score = 0
-        received_headers = msg.get_all("Received") or []
+        if received_headers is None:
+            received_headers = msg.get_all("Received") or []
         received_count = len(received_headers)
         helo = metadata.get("helo")
         from_domain = metadata.get("from_domain")
@@ -271,7 +391,7 @@ def calculate_infrastructure_score(msg, metadata):
         
         return min(score, 10)
     except Exception as e:
-        print(f"Infrastructure check error: {e}")
+        logger.warning("Infrastructure check error: %s", e)
         return 0
 
 
@@ -286,44 +406,40 @@ def calculate_mime_score(msg):
     :return: score (0-10)
     """
     try:
-        from mime_checks import detect_encodings, count_mime_parts, suspicious_encoding
-        
         score = 0
+        parts = list(msg.walk())
         
         # Detect suspicious encodings
-        encodings = detect_encodings(msg)
+        encodings = detect_encodings(msg, parts)
         if suspicious_encoding(encodings):
             score += 2
         
         # Too many MIME parts
-        part_count = count_mime_parts(msg)
+        part_count = count_mime_parts(msg, parts)
         if part_count > 10:
             score += 1.5
         
         return min(score, 10)
     except Exception as e:
-        print(f"MIME check error: {e}")
+        logger.warning("MIME check error: %s", e)
         return 0
 
 
 # ============================================================
 # TIMING SCORING
 # ============================================================
-def calculate_timing_score(msg):
+def calculate_timing_score(msg, received_headers=None):
     """
     Calculate phishing score based on timing analysis.
     
     :param msg: email message object
+    :param received_headers: optional precomputed msg.get_all("Received") list
     :return: score (0-10)
     """
     try:
-        from timing_checks import (
-            extract_timestamps, has_time_travel, 
-            total_delivery_time, suspicious_delivery
-        )
-        
         score = 0
-        received_headers = msg.get_all("Received") or []
+        if received_headers is None:
+            received_headers = msg.get_all("Received") or []
         
         # Extract timestamps
         timestamps = extract_timestamps(received_headers)
@@ -340,7 +456,7 @@ def calculate_timing_score(msg):
         
         return min(score, 10)
     except Exception as e:
-        print(f"Timing check error: {e}")
+        logger.warning("Timing check error: %s", e)
         return 0
 
 
@@ -365,7 +481,8 @@ def calculate_metadata_score(metadata):
         score += 1.5
     
     # Check for unusual mailer or headers
-    if metadata.get("x_mailer") and "unknown" in str(metadata.get("x_mailer", "")).lower():
+    x_mailer = metadata.get("x_mailer")
+    if x_mailer and _SUSPICIOUS_MAILERS.search(str(x_mailer)):
         score += 1
     
     # Domain mismatch between From and Return-Path
@@ -406,43 +523,59 @@ def calculate_ip_score(ip_analysis):
 # ============================================================
 # URL SECURITY SCORING (Original)
 # ============================================================
-def calculate_url_security_score(email_body):
+def calculate_url_security_score(email_body, parsed_urls=None):
     """
     Calculate phishing score based on ML model for URL authenticity.
     Uses fast ML-based analysis instead of DNS queries.
     
     :param email_body: email body text from analyzer
+    :param parsed_urls: optional precomputed _parse_body_urls(email_body)
     :return: tuple (overall_score, spf_results, dmarc_results, dkim_results)
     """
     if not email_body:
         return 0, [], [], []
     
+    if _url_analyzer_error:
+        return 0, [], [], []
+    
     try:
-        from url_analyzer import extract_urls, has_spf, has_dmarc, has_dkim
         from url_ml_analyzer import get_url_security_score_from_ml
         
-        urls = extract_urls(email_body)
+        if parsed_urls is None:
+            parsed_urls = _parse_body_urls(email_body)
+        urls, _, domains = parsed_urls
         if not urls:
             return 0, [], [], []
         
-        # Use ML model for fast URL authenticity scoring
-        url_score, ml_details = get_url_security_score_from_ml(urls)
+        # Use ML model for fast URL authenticity scoring. Only the ML score
+        # is cached here; DNS verdicts expire in url_analyzer's own cache.
+        url_key = tuple(urls)
+        url_score = _cache_get(_url_ml_cache, url_key)
+        if url_score is None:
+            url_score, ml_details = get_url_security_score_from_ml(urls)
+            _cache_set(_url_ml_cache, url_key, url_score)
         
-        # Still check DNS auth records for reporting
-        spf_results = []
-        dmarc_results = []
-        dkim_results = []
+        # Still check DNS auth records for reporting. URLs usually share a
+        # handful of domains, so query each unique domain once and fan the
+        # SPF/DMARC/DKIM lookups out concurrently.
+        unique = list(dict.fromkeys(domains))
         
-        for url in urls:
-            from url_analyzer import get_domain
-            domain = get_domain(url)
-            spf_results.append(has_spf(domain))
-            dmarc_results.append(has_dmarc(domain))
-            dkim_results.append(has_dkim(domain))
+        checks = (has_spf, has_dmarc, has_dkim)
+        workers = min(MAX_DNS_WORKERS, len(checks) * len(unique))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Submit every lookup before collecting any result
+            pending = [executor.map(check, unique) for check in checks]
+            spf_cache, dmarc_cache, dkim_cache = (
+                dict(zip(unique, results)) for results in pending
+            )
+        
+        spf_results = [spf_cache[d] for d in domains]
+        dmarc_results = [dmarc_cache[d] for d in domains]
+        dkim_results = [dkim_cache[d] for d in domains]
         
         return url_score, spf_results, dmarc_results, dkim_results
     except Exception as e:
-        print(f"URL security check error: {e}")
+        logger.warning("URL security check error: %s", e)
         return 0, [], [], []
 
 
@@ -460,106 +593,317 @@ def calculate_transformer_score(email_body):
         return 0
     
     try:
-        from huggingface_analyzer import get_transformer_score
-        
-        score = get_transformer_score(email_body)
-        return min(score, 10)
+        key = _body_key(email_body)
+        score = _cache_get(_transformer_cache, key)
+        if score is None:
+            from huggingface_analyzer import get_transformer_score
+            
+            score = min(get_transformer_score(email_body), 10)
+            _cache_set(_transformer_cache, key, score)
+        return score
     except Exception as e:
-        print(f"Transformer check error: {e}")
+        logger.warning("Transformer check error: %s", e)
         return 0
 
 
+def calculate_transformer_scores(email_bodies):
+    """
+    Calculate transformer scores for many bodies, batching the model calls.
+    
+    :param email_bodies: list of email body texts
+    :return: list of scores (0-10), in input order
+    """
+    scores = [0] * len(email_bodies)
+    
+    # Cache hits and blank bodies never reach the model
+    misses = {}
+    for i, email_body in enumerate(email_bodies):
+        if not email_body:
+            continue
+        key = _body_key(email_body)
+        score = _cache_get(_transformer_cache, key)
+        if score is None:
+            misses.setdefault(key, (email_body, []))[1].append(i)
+        else:
+            scores[i] = score
+    
+    if not misses:
+        return scores
+    
+    try:
+        from huggingface_analyzer import get_transformer_score_batch
+        
+        pending = list(misses.items())
+        batch_scores = get_transformer_score_batch([body for _, (body, _) in pending])
+    except Exception as e:
+        logger.warning("Transformer check error: %s", e)
+        return scores
+    
+    for (key, (_, indices)), score in zip(pending, batch_scores):
+        score = min(score, 10)
+        _cache_set(_transformer_cache, key, score)
+        for i in indices:
+            scores[i] = score
+    
+    return scores
+
+
+# ============================================================
+# MODEL WARMUP
+# ============================================================
+def warmup_models():
+    """
+    Load both ML models and run a dummy inference through each.
+    Call once at server startup so the first request doesn't pay
+    model loading and lazy-init latency.
+    """
+    try:
+        from huggingface_analyzer import warmup as warmup_transformer
+        from url_ml_analyzer import warmup as warmup_url_model
+
+        warmup_transformer()
+        warmup_url_model()
+    except Exception as e:
+        logger.warning("Model warmup error: %s", e)
+
+
 # ============================================================
 # COMPREHENSIVE PHISHING SCORE CALCULATOR
 # ============================================================
-def calculate_comprehensive_phishing_score(email_file_path):
+def calculate_comprehensive_phishing_score(email_file_path, early_exit_threshold=None):
     """
     Calculate overall phishing risk score from ALL analysis modules.
     
-    :param email_file_path: path to email file
+    :param email_file_path: path to email file, binary file object or parsed message
+    :param early_exit_threshold: optional (low, high) pair. When the rule-based
+                                 components alone pin the overall score below
+                                 low or at/above high, the ML/DNS components are
+                                 skipped and the result is flagged "partial"
     :return: dict with overall score and all component scores
     """
     try:
-        from analyzer import analyze_email, load_email
-        from infrastructure_analysis import analyze_received_headers
-        
-        # Load email
+        # Load email (parsed once, reused by analyze_email)
         msg = load_email(email_file_path)
-        email_result = analyze_email(email_file_path)
-        ip_analysis = analyze_received_headers(msg)
+        email_result = analyze_email(msg)
         
-        metadata = email_result.get("metadata", {})
-        body = email_result.get("body", "")
+        return _score_email(msg, email_result, early_exit_threshold=early_exit_threshold)
+    except Exception:
+        logger.exception("Error in comprehensive phishing score calculation")
+        return None
+
+
+def calculate_comprehensive_phishing_score_batch(email_file_paths):
+    """
+    Calculate comprehensive phishing scores for many emails at once.
+    Bodies go through the transformer in batched forward passes instead
+    of one pass per email.
+    
+    :param email_file_paths: list of paths, binary file objects or parsed messages
+    :return: list of result dicts (None for emails that failed), in input order
+    """
+    loaded = []
+    for email_file_path in email_file_paths:
+        try:
+            msg = load_email(email_file_path)
+            loaded.append((msg, analyze_email(msg)))
+        except Exception:
+            logger.exception("Error in comprehensive phishing score calculation")
+            loaded.append(None)
+    
+    bodies = [email_result.get("body", "") for _, email_result in filter(None, loaded)]
+    transformer_scores = iter(calculate_transformer_scores(bodies))
+    
+    results = []
+    for item in loaded:
+        if item is None:
+            results.append(None)
+            continue
+        
+        msg, email_result = item
+        transformer_score = next(transformer_scores)
+        try:
+            results.append(_score_email(msg, email_result, transformer_score))
+        except Exception:
+            logger.exception("Error in comprehensive phishing score calculation")
+            results.append(None)
+    
+    return results
+
+
+def score_many(email_file_paths):
+    """
+    Score many emails and return the results column-wise, one NumPy array
+    per score, ready for vectorized post-processing or a DataFrame.
+    
+    :param email_file_paths: list of paths, binary file objects or parsed messages
+    :return: dict mapping each component score name and "overall_score" to a
+             float array (NaN where the email failed), plus "risk_level" to
+             an object array of level strings (None where the email failed)
+    """
+    import numpy as np
+    
+    results = calculate_comprehensive_phishing_score_batch(email_file_paths)
+    count = len(results)
+    
+    columns = {key: np.full(count, np.nan) for key in _SCORE_KEYS + ("overall_score",)}
+    risk_levels = np.full(count, None, dtype=object)
+    
+    for i, result in enumerate(results):
+        if result is None:
+            continue
+        for key, score in result["component_scores"].items():
+            columns[key][i] = score
+        columns["overall_score"][i] = result["overall_score"]
+        risk_levels[i] = result["risk_level"]
+    
+    columns["risk_level"] = risk_levels
+    return columns
+
+
+def _score_email(msg, email_result, transformer_score=None, early_exit_threshold=None):
+    """
+    Run every component scorer on a loaded email and combine them.
+    
+    :param msg: parsed email message object
+    :param email_result: result from analyze_email(msg)
+    :param transformer_score: precomputed transformer score (computed here if None)
+    :param early_exit_threshold: optional (low, high) pair; see
+                                 calculate_comprehensive_phishing_score
+    :return: dict with overall score and all component scores
+    """
+    metadata = email_result.get("metadata", {})
+    body = email_result.get("body", "")
+    
+    # analyze_email already collected the Received headers; every scorer
+    # below reuses that list instead of walking the header list again
+    received_headers = metadata.get("received")
+    if received_headers is None:
+        received_headers = msg.get_all("Received") or []
+    ip_analysis = analyze_received_headers(msg, metadata=metadata)
+    
+    # Extract and parse the body's URLs once for both URL scorers
+    parsed_urls = None if _url_analyzer_error else _parse_body_urls(body)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # The body-based ML/DNS components are the slow ones; run them in
+        # the background while the rule-based scores are computed here.
+        # With an early-exit threshold they wait until the rule-based
+        # scores show they can still change the verdict.
+        futures = None
+        if early_exit_threshold is None:
+            futures = _submit_model_scores(executor, body, parsed_urls, transformer_score)
         
         # Calculate ALL component scores
-        attachment_score = calculate_attachment_score(msg)
-        auth_score = calculate_auth_score(msg, metadata)
-        header_score = calculate_header_score(metadata)
-        domain_score = calculate_domain_score(metadata)
-        url_score = calculate_url_score(body)
-        infrastructure_score = calculate_infrastructure_score(msg, metadata)
-        mime_score = calculate_mime_score(msg)
-        timing_score = calculate_timing_score(msg)
-        metadata_score = calculate_metadata_score(metadata)
-        ip_score = calculate_ip_score(ip_analysis)
-        url_security_score, spf_results, dmarc_results, dkim_results = calculate_url_security_score(body)
-        transformer_score = calculate_transformer_score(body)
-        
-        # Weighted overall score
-        # Each major category gets weighted
-        # Total weight = 100%
-        overall_score = (
-            (attachment_score * 0.08) +      # 8%
-            (auth_score * 0.12) +             # 12%
-            (header_score * 0.08) +           # 8%
-            (domain_score * 0.10) +           # 10%
-            (url_score * 0.08) +              # 8%
-            (infrastructure_score * 0.08) +   # 8%
-            (mime_score * 0.06) +             # 6%
-            (timing_score * 0.06) +           # 6%
-            (metadata_score * 0.08) +         # 8%
-            (ip_score * 0.07) +               # 7%
-            (url_security_score * 0.10) +     # 10%
-            (transformer_score * 0.03)        # 3%
+        component_scores = {
+            "attachment_score": calculate_attachment_score(msg),
+            "authentication_score": calculate_auth_score(msg, metadata),
+            "header_score": calculate_header_score(metadata),
+            "domain_score": calculate_domain_score(metadata),
+            "url_score": calculate_url_score(body, parsed_urls),
+            "infrastructure_score": calculate_infrastructure_score(msg, metadata, received_headers),
+            "mime_score": calculate_mime_score(msg),
+            "timing_score": calculate_timing_score(msg, received_headers),
+            "metadata_score": calculate_metadata_score(metadata),
+            "ip_analysis_score": calculate_ip_score(ip_analysis),
+            "url_security_score": None,
+            "transformer_score": transformer_score
+        }
+        
+        overall_score, pending_weight = _weighted_total(component_scores)
+        partial = (
+            early_exit_threshold is not None
+            and _verdict_settled(overall_score, pending_weight, early_exit_threshold)
         )
         
-        # Determine if SPF, DMARC, DKIM are present
-        spf_present = any(spf_results) if spf_results else False
-        dmarc_present = any(dmarc_results) if dmarc_results else False
-        dkim_present = any(dkim_results) if dkim_results else False
-        
-        return {
-            "overall_score": round(overall_score, 2),
-            "risk_level": get_risk_level(overall_score),
-            "spf": spf_present,
-            "dmarc": dmarc_present,
-            "dkim": dkim_present,
-            "originating_ip": ip_analysis.get("originating_ip"),
-            "from_address": metadata.get("from"),
-            "to_address": metadata.get("to"),
-            "component_scores": {
-                "attachment_score": attachment_score,
-                "authentication_score": auth_score,
-                "header_score": header_score,
-                "domain_score": domain_score,
-                "url_score": url_score,
-                "infrastructure_score": infrastructure_score,
-                "mime_score": mime_score,
-                "timing_score": timing_score,
-                "metadata_score": metadata_score,
-                "ip_analysis_score": ip_score,
-                "url_security_score": url_security_score,
-                "transformer_score": transformer_score
-            },
-            "details": {
-                "header_mismatch": metadata.get("reply_to_mismatch", False),
-                "domain_mismatch": metadata.get("from_domain") != metadata.get("return_path_domain"),
-                "total_ips_found": len(ip_analysis.get("ips", [])),
-            }
+        spf_results = dmarc_results = dkim_results = []
+        if not partial:
+            if futures is None:
+                futures = _submit_model_scores(executor, body, parsed_urls, transformer_score)
+            url_security_future, transformer_future = futures
+            
+            (component_scores["url_security_score"],
+             spf_results, dmarc_results, dkim_results) = url_security_future.result()
+            if transformer_future is not None:
+                component_scores["transformer_score"] = transformer_future.result()
+            
+            overall_score, _ = _weighted_total(component_scores)
+    
+    # Determine if SPF, DMARC, DKIM are present
+    spf_present = any(spf_results) if spf_results else False
+    dmarc_present = any(dmarc_results) if dmarc_results else False
+    dkim_present = any(dkim_results) if dkim_results else False
+    
+    result = {
+        "overall_score": round(overall_score, 2),
+        "risk_level": get_risk_level(overall_score),
+        "spf": spf_present,
+        "dmarc": dmarc_present,
+        "dkim": dkim_present,
+        "originating_ip": ip_analysis.get("originating_ip"),
+        "from_address": metadata.get("from"),
+        "to_address": metadata.get("to"),
+        "component_scores": component_scores,
+        "details": {
+            "header_mismatch": metadata.get("reply_to_mismatch", False),
+            "domain_mismatch": metadata.get("from_domain") != metadata.get("return_path_domain"),
+            "total_ips_found": len(ip_analysis.get("ips", [])),
         }
-    except Exception as e:
-        print(f"Error in comprehensive phishing score calculation: {e}")
-        return None
+    }
+    
+    # Skipped components are reported as None; overall_score is then the
+    # rule-based total, which already settles the risk level
+    if partial:
+        result["partial"] = True
+    
+    return result
+
+
+def _weighted_total(component_scores):
+    """
+    Combine component scores with their _WEIGHTS.
+    
+    :param component_scores: dict keyed by _SCORE_KEYS; None marks a
+                             component that has not been computed
+    :return: tuple (weighted sum of the known scores, summed weight of the
+             components still None)
+    """
+    known = []
+    pending = []
+    for key, weight in zip(_SCORE_KEYS, _WEIGHTS):
+        score = component_scores[key]
+        if score is None:
+            pending.append(weight)
+        else:
+            known.append(score * weight)
+    return math.fsum(known), math.fsum(pending)
+
+
+def _submit_model_scores(executor, body, parsed_urls=None, transformer_score=None):
+    """
+    Start the URL security and (unless already known) transformer scorers.
+    
+    :return: tuple (url_security_future, transformer_future or None)
+    """
+    url_security_future = executor.submit(calculate_url_security_score, body, parsed_urls)
+    transformer_future = None
+    if transformer_score is None:
+        transformer_future = executor.submit(calculate_transformer_score, body)
+    return url_security_future, transformer_future
+
+
+def _verdict_settled(known_score, pending_weight, early_exit_threshold):
+    """
+    Check whether the components still pending can change the verdict.
+    Every component scores 0-10, so they can add at most pending_weight * 10.
+    
+    :param known_score: weighted total of the components computed so far
+    :param pending_weight: summed weight of the components not yet computed
+    :param early_exit_threshold: (low, high) pair
+    :return: True if the total is certain to stay below low, or is already
+             at or above high
+    """
+    low, high = early_exit_threshold
+    return known_score + pending_weight * 10 < low or known_score >= high
 
 
 # ============================================================
@@ -621,6 +965,11 @@ def calculate_phishing_score(email_result, ip_analysis):
 # ============================================================
 # RISK LEVEL DETERMINATION
 # ============================================================
+# Lower bound (inclusive) of each level above MINIMAL
+_RISK_THRESHOLDS = (2, 4, 6, 8)
+_RISK_LEVELS = ("MINIMAL", "LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+
 def get_risk_level(score):
     """
     Determine risk level based on score.
@@ -628,16 +977,29 @@ def get_risk_level(score):
     :param score: phishing score (0-10)
     :return: risk level string
     """
-    if score >= 8:
-        return "CRITICAL"
-    elif score >= 6:
-        return "HIGH"
-    elif score >= 4:
-        return "MEDIUM"
-    elif score >= 2:
-        return "LOW"
-    else:
-        return "MINIMAL"
+    # NaN compares false against every threshold, so it is MINIMAL as with
+    # the old if/elif chain (bisect alone would place it at the top)
+    if math.isnan(score):
+        return _RISK_LEVELS[0]
+    # bisect_right: a score equal to a threshold belongs to the higher level
+    return _RISK_LEVELS[bisect.bisect_right(_RISK_THRESHOLDS, score)]
+
+
+def get_risk_levels(scores):
+    """
+    Vectorized get_risk_level for bulk results (e.g. score_many columns).
+    
+    :param scores: array-like of phishing scores; NaN marks a failed email
+    :return: NumPy object array of risk level strings (None for NaN)
+    """
+    import numpy as np
+    
+    scores = np.asarray(scores, dtype=float)
+    levels = np.array(_RISK_LEVELS, dtype=object)[
+        np.searchsorted(_RISK_THRESHOLDS, scores, side="right")
+    ]
+    levels[np.isnan(scores)] = None
+    return levels
 
 
 # ============================================================
@@ -656,6 +1018,20 @@ def save_to_json(phishing_score, filename="phishing_assessment.json"):
         "assessment": phishing_score
     }
     
+    if orjson is not None:
+        try:
+            data = orjson.dumps(
+                output_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            )
+        except TypeError:
+            # Types orjson can't encode go through json below
+            data = None
+        if data is not None:
+            with open(filename, 'wb') as f:
+                f.write(data)
+            return filename
+    
     with open(filename, 'w') as f:
         json.dump(output_data, f, indent=2)
     
@@ -4,9 +4,46 @@ Analyzes timestamp consistency in Received headers
 Detects forged or manipulated email timing
 """
 
+import operator
 import re
 from datetime import datetime
 
+# Matches standard email timestamp formats
+_TS_FORMAT = "%a, %d %b %Y %H:%M:%S"
+_TS_RE = re.compile(
+    r"\w{3},\s(?P<d>\d{1,2})\s(?P<mon>\w{3})\s(?P<y>\d{4})\s"
+    r"(?P<H>\d{2}):(?P<M>\d{2}):(?P<S>\d{2})"
+)
+
+# Names strptime's %a / %b accept (case-insensitive)
+_WEEKDAYS = frozenset({"mon", "tue", "wed", "thu", "fri", "sat", "sun"})
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+
+# --------------------------------------------------
+# Build a datetime from a timestamp match
+# --------------------------------------------------
+def _parse_timestamp(match):
+
+    text = match.group()
+
+    # Non-ASCII digits: leave the corner cases to strptime
+    if not text.isascii():
+        return datetime.strptime(text, _TS_FORMAT)
+
+    month = _MONTHS.get(match["mon"].lower())
+    if month is None or text[:3].lower() not in _WEEKDAYS:
+        raise ValueError(f"unknown day or month name in {text!r}")
+
+    # datetime() range-checks the fields like strptime does
+    return datetime(
+        int(match["y"]), month, int(match["d"]),
+        int(match["H"]), int(match["M"]), int(match["S"])
+    )
+
 
 # --------------------------------------------------
 # Extract timestamps from Received headers
@@ -17,19 +54,11 @@ def extract_timestamps(received_headers):
 
     for header in received_headers:
 
-        # Matches standard email timestamp formats
-        match = re.search(
-            r"\w{3},\s\d{1,2}\s\w{3}\s\d{4}\s\d{2}:\d{2}:\d{2}",
-            header
-        )
+        match = _TS_RE.search(header)
 
         if match:
             try:
-                parsed_time = datetime.strptime(
-                    match.group(),
-                    "%a, %d %b %Y %H:%M:%S"
-                )
-                timestamps.append(parsed_time)
+                timestamps.append(_parse_timestamp(match))
             except:
                 continue
 
@@ -41,14 +70,8 @@ def extract_timestamps(received_headers):
 # --------------------------------------------------
 def has_time_travel(timestamps):
 
-    if len(timestamps) < 2:
-        return False
-
-    for i in range(len(timestamps) - 1):
-        if timestamps[i] < timestamps[i + 1]:
-            return True
-
-    return False
+    # Pairwise newer-than-previous test, stopping at the first hit
+    return any(map(operator.lt, timestamps, timestamps[1:]))
 
 
 # --------------------------------------------------
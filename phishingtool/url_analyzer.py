@@ -4,6 +4,9 @@ import re
 import socket
 import ipaddress
 import threading
+import time
+import functools
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional
@@ -35,7 +38,10 @@ resolver.timeout = 2.0  # Reduced timeout for faster failure
 resolver.lifetime = 2.0
 socket.setdefaulttimeout(2.0)
 
-_dns_cache = {}
+# Bounded LRU of DNS verdicts: key -> (value, expires_at)
+DNS_CACHE_MAXSIZE = 4096
+DNS_CACHE_TTL = 300  # seconds
+_dns_cache: "OrderedDict[str, tuple]" = OrderedDict()
 _cache_lock = threading.Lock()
 
 # Max workers for parallel DNS queries
@@ -83,6 +89,7 @@ def extract_urls(text: str) -> List[str]:
 # DOMAIN UTILITIES
 # =====================================
 
+@functools.lru_cache(maxsize=4096)
 def get_domain(url: str) -> str:
     parsed = urlparse(url)
     return (parsed.hostname or "").lower()
@@ -146,12 +153,23 @@ def detect_lookalike(domain: str) -> Optional[str]:
 
 def _get_cache(key: str) -> Optional[bool]:
     with _cache_lock:
-        return _dns_cache.get(key)
+        entry = _dns_cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del _dns_cache[key]
+            return None
+        _dns_cache.move_to_end(key)
+        return value
 
 
 def _set_cache(key: str, value: bool):
     with _cache_lock:
-        _dns_cache[key] = value
+        _dns_cache[key] = (value, time.monotonic() + DNS_CACHE_TTL)
+        _dns_cache.move_to_end(key)
+        if len(_dns_cache) > DNS_CACHE_MAXSIZE:
+            _dns_cache.popitem(last=False)
 
 
 def has_spf(domain: str) -> bool:
@@ -390,7 +408,6 @@ def analyze_email_security(email_file: str) -> Dict[str, object]:
 # =====================================
 
 if __name__ == "__main__":
-    import time
     
     email_file = "email2.eml"
 
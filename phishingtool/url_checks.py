@@ -8,6 +8,12 @@ import re
 
 SUSPICIOUS_TLDS = [".ru", ".tk", ".xyz", ".top", ".gq", ".ml", ".cf"]
 
+# str.endswith takes a tuple and checks every suffix in one C call
+_SUSPICIOUS_TLD_SUFFIXES = tuple(SUSPICIOUS_TLDS)
+
+# Dotted-quad host, compiled once instead of on every is_ip_url() call
+_IP_HOST_RE = re.compile(r"^\d{1,3}(\.\d{1,3}){3}$")
+
 
 # --------------------------------------------------
 # Detect IP-based URL
@@ -17,7 +23,7 @@ def is_ip_url(domain):
     if not domain:
         return False
 
-    return bool(re.match(r"^\d{1,3}(\.\d{1,3}){3}$", domain))
+    return _IP_HOST_RE.match(domain) is not None
 
 
 # --------------------------------------------------
@@ -28,11 +34,7 @@ def has_suspicious_tld(domain):
     if not domain:
         return False
 
-    for tld in SUSPICIOUS_TLDS:
-        if domain.endswith(tld):
-            return True
-
-    return False
+    return domain.endswith(_SUSPICIOUS_TLD_SUFFIXES)
 
 
 # --------------------------------------------------
@@ -78,34 +80,25 @@ def run_url_checks(urls):
         "insecure_http": False
     }
 
-    for url in urls:
-
-        domain = url.get("domain")
-        full_url = url.get("full_url")
-        scheme = url.get("scheme")
-
-        if is_ip_url(domain):
-            results["ip_based_url"] = True
-
-        if has_suspicious_tld(domain):
-            results["suspicious_tld_url"] = True
-
-        if is_long_url(full_url):
-            results["long_url_detected"] = True
-
-        if too_many_subdomains(domain):
-            results["too_many_subdomains"] = True
+    # Pull each field into its own column once, then let every check
+    # short-circuit on its first hit instead of testing all URLs
+    domains = [url.get("domain") for url in urls]
+    full_urls = [url.get("full_url") for url in urls]
+    schemes = [url.get("scheme") for url in urls]
 
-        if is_insecure_scheme(scheme):
-            results["insecure_http"] = True
+    results["ip_based_url"] = any(map(is_ip_url, domains))
+    results["suspicious_tld_url"] = any(map(has_suspicious_tld, domains))
+    results["long_url_detected"] = any(map(is_long_url, full_urls))
+    results["too_many_subdomains"] = any(map(too_many_subdomains, domains))
+    results["insecure_http"] = any(map(is_insecure_scheme, schemes))
 
     # Overall URL risk flag
-    results["url_suspicious"] = any([
-        results["ip_based_url"],
-        results["suspicious_tld_url"],
-        results["long_url_detected"],
-        results["too_many_subdomains"],
-        results["insecure_http"]
-    ])
+    results["url_suspicious"] = (
+        results["ip_based_url"]
+        or results["suspicious_tld_url"]
+        or results["long_url_detected"]
+        or results["too_many_subdomains"]
+        or results["insecure_http"]
+    )
 
     return results
@@ -9,6 +9,13 @@ import re
 from dataclasses import dataclass
 import logging
 
+# Compiled once instead of on every call
+_SCHEME_RE = re.compile(r'^https?://')
+_IP_HOST_RE = re.compile(r'^\d+\.\d+\.\d+\.\d+$')
+
+# URLs per padded forward pass in analyze_urls_with_ml_parallel
+URL_BATCH_SIZE = 32
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -44,7 +51,7 @@ def extract_domain_from_url(url: str) -> str:
     """Extract domain from URL"""
     try:
         # Remove protocol
-        domain = re.sub(r'^https?://', '', url)
+        domain = _SCHEME_RE.sub('', url, count=1)
         # Remove path and query
         domain = domain.split('/')[0].split('?')[0]
         return domain
@@ -73,8 +80,7 @@ def heuristic_url_check(url: str) -> Tuple[bool, float, List[str]]:
     domain = extract_domain_from_url(url)
     
     # Check for IP address instead of domain
-    ip_pattern = r'^\d+\.\d+\.\d+\.\d+$'
-    if re.match(ip_pattern, domain):
+    if _IP_HOST_RE.match(domain):
         reasons.append("Using IP address instead of domain")
         score -= 0.4
     
@@ -107,6 +113,30 @@ def heuristic_url_check(url: str) -> Tuple[bool, float, List[str]]:
     return is_legitimate, confidence, reasons
 
 
+def _result_from_prediction(url: str, prediction: dict) -> URLAuthenticityResult:
+    """Convert one classifier prediction into a URLAuthenticityResult"""
+    label = prediction['label']
+    confidence = prediction['score']
+    
+    # DistilBERT sentiment model: NEGATIVE = suspicious/phishing, POSITIVE = legitimate
+    is_phishing = label == 'NEGATIVE'
+    
+    if is_phishing:
+        reasons = [f"ML model detected suspicious URL patterns (confidence: {confidence:.2%})"]
+        score = int(confidence * 10)
+    else:
+        reasons = [f"ML model validated URL as legitimate"]
+        score = int((1 - confidence) * 10)
+    
+    return URLAuthenticityResult(
+        url=url,
+        is_legitimate=not is_phishing,
+        confidence=confidence,
+        score=score,
+        reasons=reasons
+    )
+
+
 def analyze_url_with_ml(url: str) -> URLAuthenticityResult:
     """
     Analyze URL authenticity using ML model
@@ -117,22 +147,7 @@ def analyze_url_with_ml(url: str) -> URLAuthenticityResult:
     try:
         if MODEL_LOADED and url_classifier:
             # Use ML model for classification
-            result = url_classifier(url, truncation=True)[0]
-            label = result['label']
-            confidence = result['score']
-            
-            # DistilBERT sentiment model: NEGATIVE = suspicious/phishing, POSITIVE = legitimate
-            is_phishing = label == 'NEGATIVE'
-            
-            if is_phishing:
-                reasons.append(f"ML model detected suspicious URL patterns (confidence: {confidence:.2%})")
-                score = int(confidence * 10)
-            else:
-                reasons.append(f"ML model validated URL as legitimate")
-                score = int((1 - confidence) * 10)
-            
-            is_legitimate = not is_phishing
-            
+            return _result_from_prediction(url, url_classifier(url, truncation=True)[0])
         else:
             # Fallback to heuristic analysis
             is_legitimate, confidence, heuristic_reasons = heuristic_url_check(url)
@@ -172,12 +187,29 @@ def analyze_urls_with_ml_parallel(urls: List[str]) -> List[URLAuthenticityResult
     if not urls:
         return []
     
-    # For batch inference, process all at once (model handles this efficiently)
-    results = []
-    for url in urls:
-        results.append(analyze_url_with_ml(url))
+    if not (MODEL_LOADED and url_classifier):
+        return [analyze_url_with_ml(url) for url in urls]
     
-    return results
+    # One pipeline call over the whole list, padded into shared batches
+    try:
+        predictions = url_classifier(list(urls), truncation=True, batch_size=URL_BATCH_SIZE)
+    except Exception as e:
+        logger.warning(f"Batch URL analysis failed, analyzing one by one: {e}")
+        return [analyze_url_with_ml(url) for url in urls]
+    
+    return [
+        _result_from_prediction(url, prediction)
+        for url, prediction in zip(urls, predictions)
+    ]
+
+
+def warmup():
+    """
+    Run one dummy inference so the first real URL check doesn't pay
+    lazy initialization costs.
+    """
+    if MODEL_LOADED and url_classifier:
+        url_classifier("https://example.com", truncation=True)
 
 
 def get_url_security_score_from_ml(urls: List[str]) -> Tuple[int, dict]:
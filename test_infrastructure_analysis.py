@@ -0,0 +1,60 @@
+"""
+Tests for IP extraction in phishingtool/infrastructure_analysis.py
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'phishingtool'))
+
+from infrastructure_analysis import extract_ips, get_first_external_ip, iter_ips
+
+
+def _ips(*received, x_originating_ip=None):
+    return extract_ips({"received": list(received), "x_originating_ip": x_originating_ip})
+
+
+def test_ipv4_mapped_ipv6_keeps_embedded_ipv4():
+    ips = _ips("from a (a [::ffff:8.8.8.8]) by b")
+    assert ips == ["8.8.8.8", "::ffff:8.8.8.8"]
+    assert get_first_external_ip(ips) == "8.8.8.8"
+
+
+def test_ipv4_mapped_private_address_is_not_external():
+    assert get_first_external_ip(_ips("from a ([::ffff:10.0.0.1]) by b")) is None
+
+
+def test_ipv4_before_ipv6_within_a_header():
+    ips = _ips("from x ([2001:4860::8888]) by y ([203.0.113.50])",
+               "from z ([8.8.4.4]) by w")
+    assert ips == ["203.0.113.50", "2001:4860::8888", "8.8.4.4"]
+
+
+def test_private_and_loopback_addresses_are_skipped():
+    ips = _ips("from a ([10.0.0.1]) by b ([192.168.1.5])",
+               "from c ([::1]) by d ([fe80::1])",
+               "from e ([2a00:1450:4864:20::52f]) by f")
+    assert get_first_external_ip(ips) == "2a00:1450:4864:20::52f"
+
+
+def test_out_of_range_octets_and_timestamps_are_not_ips():
+    ips = _ips("from a ([1.2.3.999]) by b; Tue, 1 Oct 2024 12:34:56 +0000")
+    assert ips == []
+
+
+def test_x_originating_ip_is_scanned_after_received():
+    ips = _ips("from a ([10.0.0.1]) by b", x_originating_ip="[198.51.100.7]")
+    assert ips == ["10.0.0.1", "198.51.100.7"]
+
+
+def test_duplicates_removed_in_extract_ips_but_kept_in_iter_ips():
+    metadata = {"received": ["from a ([8.8.8.8]) by b ([8.8.8.8])"]}
+    assert list(iter_ips(metadata)) == ["8.8.8.8", "8.8.8.8"]
+    assert extract_ips(metadata) == ["8.8.8.8"]
+
+
+@pytest.mark.parametrize("ip_list", [None, [], ["not-an-ip", "300.1.1.1"]])
+def test_no_external_ip(ip_list):
+    assert get_first_external_ip(ip_list) is None
@@ -0,0 +1,134 @@
+"""
+Tests for phishingtool/parser.py
+"""
+
+import hashlib
+import os
+import sys
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'phishingtool'))
+
+from parser import (
+    HASH_CHUNK_CHARS, analyze_email, decode_body, extract_attachments, extract_urls
+)
+
+
+def _alternative_email():
+    msg = EmailMessage()
+    msg["From"] = "Support <support@example.com>"
+    msg["To"] = "user@example.org"
+    msg["Subject"] = "Verify your account"
+    msg.set_content("Click here to verify your account")
+    msg.add_alternative(
+        '<html><body><a href="http://evil-login.xyz/verify">Click here</a></body></html>',
+        subtype="html",
+    )
+    return msg
+
+
+def _reparse(msg):
+    return BytesParser(policy=policy.default).parsebytes(bytes(msg))
+
+
+# -------------------------------
+# extract_urls
+# -------------------------------
+def test_extract_urls_empty_body():
+    assert extract_urls("") == []
+    assert extract_urls(None) == []
+
+
+def test_extract_urls_keeps_duplicates_in_order():
+    body = "see http://a.com/x and https://b.ru/ then http://a.com/x again"
+    assert [u["full_url"] for u in extract_urls(body)] == [
+        "http://a.com/x", "https://b.ru/", "http://a.com/x"
+    ]
+
+
+def test_extract_urls_www_gets_http_scheme():
+    (url,) = extract_urls("visit www.example.xyz/login now")
+    assert url == {
+        "full_url": "http://www.example.xyz/login",
+        "domain": "www.example.xyz",
+        "path": "/login",
+        "scheme": "http",
+    }
+
+
+def test_extract_urls_params_not_in_path():
+    # urlparse splits ";params" off the last path segment
+    (url,) = extract_urls("http://a.com/x;p?q=1#f")
+    assert url["path"] == "/x"
+    assert url["domain"] == "a.com"
+
+
+def test_extract_urls_stops_at_delimiters():
+    body = '<a href="http://evil.xyz/verify">(https://ok.com/a)</a>'
+    assert [u["full_url"] for u in extract_urls(body)] == [
+        "http://evil.xyz/verify", "https://ok.com/a"
+    ]
+
+
+# -------------------------------
+# Body assembly
+# -------------------------------
+def test_decode_body_joins_plain_and_html_in_mime_order():
+    body = decode_body(_reparse(_alternative_email()))
+    assert body.startswith("Click here to verify your account\n")
+    assert body.endswith('<a href="http://evil-login.xyz/verify">Click here</a></body></html>\n')
+
+
+def test_decode_body_skips_attachments():
+    msg = _alternative_email()
+    msg.add_attachment(b"not body text", maintype="text", subtype="plain",
+                       filename="notes.txt")
+    assert "not body text" not in decode_body(_reparse(msg))
+
+
+def test_decode_body_applies_declared_charset():
+    msg = EmailMessage()
+    msg.set_content("plain")
+    msg.add_alternative("caf\u00e9 \u00fcber", subtype="html", charset="iso-8859-1")
+    assert "caf\u00e9 \u00fcber" in decode_body(_reparse(msg))
+
+
+def test_decode_body_single_part():
+    msg = EmailMessage()
+    msg.set_content("just text")
+    assert decode_body(_reparse(msg)) == "just text\n"
+
+
+def test_analyze_email_finds_href_only_url(tmp_path):
+    path = tmp_path / "alt.eml"
+    path.write_bytes(bytes(_alternative_email()))
+    result = analyze_email(str(path))
+    assert [u["full_url"] for u in result["urls"]] == ["http://evil-login.xyz/verify"]
+    assert result["body_length"] == len(decode_body(_reparse(_alternative_email())))
+
+
+# -------------------------------
+# Attachment hashing
+# -------------------------------
+def test_attachment_hash_streams_across_chunks():
+    # Several base64 chunks, with a length that is not a multiple of 3
+    data = bytes(range(256)) * (HASH_CHUNK_CHARS // 64) + b"tail"
+    msg = EmailMessage()
+    msg.set_content("see attachment")
+    msg.add_attachment(data, maintype="application", subtype="octet-stream",
+                       filename="payload.bin")
+    (attachment,) = extract_attachments(_reparse(msg))
+    assert attachment["size_bytes"] == len(data)
+    assert attachment["sha256"] == hashlib.sha256(data).hexdigest()
+
+
+def test_empty_attachment_has_no_hash():
+    msg = EmailMessage()
+    msg.set_content("see attachment")
+    msg.add_attachment(b"", maintype="application", subtype="octet-stream",
+                       filename="empty.bin")
+    (attachment,) = extract_attachments(_reparse(msg))
+    assert attachment["size_bytes"] == 0
+    assert attachment["sha256"] is None
@@ -0,0 +1,144 @@
+"""
+Tests for phishingtool/score_calculator.py
+"""
+
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'phishingtool'))
+
+import score_calculator
+from score_calculator import (
+    _verdict_settled, calculate_comprehensive_phishing_score, get_risk_level
+)
+
+SAMPLE_EMAIL = os.path.join(os.path.dirname(__file__), 'phishingtool', 'email2.eml')
+
+
+def _baseline_risk_level(score):
+    """The original if/elif chain get_risk_level replaced."""
+    if score >= 8:
+        return "CRITICAL"
+    elif score >= 6:
+        return "HIGH"
+    elif score >= 4:
+        return "MEDIUM"
+    elif score >= 2:
+        return "LOW"
+    else:
+        return "MINIMAL"
+
+
+BOUNDARY_SCORES = [
+    -1, 0, 1.99, 2, 2.01, 3.999, 4, 5.5, 5.999999, 6, 7.99, 8, 9.4, 10, 11,
+    math.nextafter(2, 0), math.nextafter(8, 0), math.inf, -math.inf,
+]
+
+
+# -------------------------------
+# get_risk_level
+# -------------------------------
+@pytest.mark.parametrize("score", BOUNDARY_SCORES)
+def test_get_risk_level_matches_baseline(score):
+    assert get_risk_level(score) == _baseline_risk_level(score)
+
+
+@pytest.mark.parametrize("score, level", [
+    (1.99, "MINIMAL"), (2, "LOW"), (4, "MEDIUM"), (6, "HIGH"), (8, "CRITICAL"),
+])
+def test_threshold_belongs_to_higher_level(score, level):
+    assert get_risk_level(score) == level
+
+
+def test_get_risk_level_nan_is_minimal():
+    assert get_risk_level(math.nan) == "MINIMAL"
+
+
+# -------------------------------
+# get_risk_levels (vectorized)
+# -------------------------------
+def test_get_risk_levels_matches_scalar():
+    np = pytest.importorskip("numpy")
+    levels = score_calculator.get_risk_levels(np.array(BOUNDARY_SCORES))
+    assert list(levels) == [get_risk_level(s) for s in BOUNDARY_SCORES]
+
+
+def test_get_risk_levels_nan_marks_failed_email():
+    pytest.importorskip("numpy")
+    levels = score_calculator.get_risk_levels([1.0, math.nan, 8.0])
+    assert list(levels) == ["MINIMAL", None, "CRITICAL"]
+
+
+# -------------------------------
+# Early exit ("partial" results)
+# -------------------------------
+@pytest.mark.parametrize("known, pending, threshold, settled", [
+    (1.0, 0.2, (4, 8), True),      # 1 + 2 < 4: cannot reach low
+    (1.0, 0.3, (4, 8), False),     # 1 + 3 == 4: might reach low
+    (8.0, 0.2, (4, 8), True),      # already at high
+    (7.9, 0.2, (4, 8), False),     # could still land anywhere
+    (0.0, 0.0, (0, 8), False),     # 0 is not below low=0
+])
+def test_verdict_settled(known, pending, threshold, settled):
+    assert _verdict_settled(known, pending, threshold) is settled
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    """Replace the slow ML/DNS scorers with fakes that record their calls."""
+    calls = []
+
+    def fake_url_security_score(email_body, parsed_urls=None):
+        calls.append("url_security")
+        return 5, [True], [False], [True]
+
+    def fake_transformer_score(email_body):
+        calls.append("transformer")
+        return 6
+
+    monkeypatch.setattr(score_calculator, "calculate_url_security_score",
+                        fake_url_security_score)
+    monkeypatch.setattr(score_calculator, "calculate_transformer_score",
+                        fake_transformer_score)
+    return calls
+
+
+def test_no_threshold_runs_every_component(model_calls):
+    result = calculate_comprehensive_phishing_score(SAMPLE_EMAIL)
+    assert sorted(model_calls) == ["transformer", "url_security"]
+    assert "partial" not in result
+    assert result["component_scores"]["url_security_score"] == 5
+    assert result["component_scores"]["transformer_score"] == 6
+    assert result["spf"] is True and result["dmarc"] is False
+
+
+def test_settled_low_skips_models_and_flags_partial(model_calls):
+    result = calculate_comprehensive_phishing_score(
+        SAMPLE_EMAIL, early_exit_threshold=(100, 200)
+    )
+    assert model_calls == []
+    assert result["partial"] is True
+    assert result["component_scores"]["url_security_score"] is None
+    assert result["component_scores"]["transformer_score"] is None
+    assert (result["spf"], result["dmarc"], result["dkim"]) == (False, False, False)
+    assert result["risk_level"] == get_risk_level(result["overall_score"])
+
+
+def test_settled_high_skips_models_and_flags_partial(model_calls):
+    result = calculate_comprehensive_phishing_score(
+        SAMPLE_EMAIL, early_exit_threshold=(-1, 0)
+    )
+    assert model_calls == []
+    assert result["partial"] is True
+
+
+def test_unsettled_threshold_matches_full_result(model_calls):
+    full = calculate_comprehensive_phishing_score(SAMPLE_EMAIL)
+    thresholded = calculate_comprehensive_phishing_score(
+        SAMPLE_EMAIL, early_exit_threshold=(0, 100)
+    )
+    assert sorted(model_calls) == sorted(["transformer", "url_security"] * 2)
+    assert thresholded == full
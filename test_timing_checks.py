@@ -0,0 +1,105 @@
+"""
+Tests for phishingtool/timing_checks.py
+"""
+
+import os
+import random
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'phishingtool'))
+
+from timing_checks import (
+    _TS_FORMAT, _TS_RE, _parse_timestamp, extract_timestamps,
+    has_time_travel, total_delivery_time
+)
+
+
+def _outcome(func, *args):
+    """Result of func(*args), or the exception type it raised."""
+    try:
+        return func(*args)
+    except ValueError:
+        return ValueError
+
+
+def _assert_matches_strptime(text):
+    match = _TS_RE.search(text)
+    assert match is not None, text
+    assert _outcome(_parse_timestamp, match) == _outcome(
+        datetime.strptime, match.group(), _TS_FORMAT
+    ), text
+
+
+# -------------------------------
+# _parse_timestamp vs strptime
+# -------------------------------
+@pytest.mark.parametrize("text", [
+    "Tue, 01 Oct 2024 12:34:56",
+    "tue, 1 oct 2024 12:34:56",
+    "SAT, 29 Feb 2020 00:00:00",
+    "Sun, 29 Feb 2021 00:00:00",     # not a leap year
+    "Mon, 31 Apr 2024 10:00:00",     # no 31st
+    "Mon, 00 Jan 2024 10:00:00",
+    "Mon, 01 Jan 0000 10:00:00",
+    "Mon, 01 Jan 2024 24:00:00",
+    "Mon, 01 Jan 2024 23:60:00",
+    "Mon, 01 Jan 2024 23:59:60",
+    "Mon, 01 Jan 2024 23:59:61",
+    "Xyz, 01 Jan 2024 10:00:00",     # unknown weekday
+    "Mon, 01 Foo 2024 10:00:00",     # unknown month
+    "Mon, 01 Jan 2024 1٢:00:00",  # non-ASCII digit
+    "Mon, ١٢ Jan 2024 10:00:00",
+])
+def test_parse_timestamp_matches_strptime(text):
+    _assert_matches_strptime(text)
+
+
+def test_parse_timestamp_matches_strptime_randomized():
+    rng = random.Random(1234)
+    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun", "mon", "FRI", "Abc"]
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug",
+              "Sep", "Oct", "Nov", "Dec", "jan", "DEC", "Xyz"]
+
+    for _ in range(20000):
+        text = "{}, {} {} {:04d} {:02d}:{:02d}:{:02d}".format(
+            rng.choice(days), rng.randint(0, 32), rng.choice(months),
+            rng.randint(0, 9999), rng.randint(0, 25), rng.randint(0, 61),
+            rng.randint(0, 62),
+        )
+        _assert_matches_strptime(text)
+
+
+# -------------------------------
+# Header-level checks
+# -------------------------------
+RECEIVED = [
+    "from c by d; Tue, 01 Oct 2024 12:00:30 +0000",
+    "from b by c; Tue, 01 Oct 2024 12:00:10 +0000",
+    "from a by b; Tue, 01 Oct 2024 12:00:00 +0000",
+]
+
+
+def test_extract_timestamps_skips_invalid_dates():
+    headers = RECEIVED + ["from x by y; Mon, 31 Apr 2024 10:00:00 +0000",
+                          "from x by y; no date here"]
+    assert extract_timestamps(headers) == [
+        datetime(2024, 10, 1, 12, 0, 30),
+        datetime(2024, 10, 1, 12, 0, 10),
+        datetime(2024, 10, 1, 12, 0, 0),
+    ]
+
+
+def test_has_time_travel():
+    timestamps = extract_timestamps(RECEIVED)
+    assert not has_time_travel(timestamps)
+    assert has_time_travel(timestamps[::-1])
+    assert not has_time_travel(timestamps[:1])
+    assert not has_time_travel([])
+
+
+def test_total_delivery_time():
+    assert total_delivery_time(extract_timestamps(RECEIVED)) == 30
+    assert total_delivery_time(extract_timestamps(RECEIVED[:1])) is None
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for production servers.
+
+Run with gunicorn (pre-forked workers, each with a thread pool):
+    gunicorn -w $(nproc) -k gthread --threads 8 wsgi:app
+"""
+
+from main import app
+
+__all__ = ["app"]